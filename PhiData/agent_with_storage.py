@@ -8,6 +8,7 @@ from phi.vectordb.chroma import ChromaDb
 from phi.model.google import Gemini
 from phi.embedder.google import GeminiEmbedder
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbedder
 import os
 
 load_dotenv()
@@ -30,10 +31,14 @@ Used ChromaDB which is more flexible
 It automatically adapts to whatever dimensions the embedder provides
 """
 
-embedder = GeminiEmbedder(
-    model_name="models/embedding-001",
-    task_type="retrieval_document",
-    api_key=os.getenv("GOOGLE_API_KEY")
+# The cache keeps the vectors on disk, so reloading the recipes on every start does not call Gemini again
+embedder = CachedEmbedder(
+    embedder=GeminiEmbedder(
+        model_name="models/embedding-001",
+        task_type="retrieval_document",
+        api_key=os.getenv("GOOGLE_API_KEY")
+    ),
+    cache_dir="embedding_cache"
 )
 
 # Initialize knowledge base with ChromaDB
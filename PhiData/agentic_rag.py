@@ -9,6 +9,10 @@ from phi.vectordb.chroma import ChromaDb
 from phi.embedder.google import GeminiEmbedder
 import os
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbedder
+from hybrid_search import HybridRetriever, KeywordIndex
+from rag_ingest import incremental_load
+from retrieval_cache import RetrievalCache
 
 load_dotenv()
 
@@ -26,10 +30,15 @@ if not os.path.exists(pdf_path):
 print(f"PDF file found at {pdf_path}")
 
 # Create GeminiEmbedder with the specified model and task type
-embedder = GeminiEmbedder(
-    model="models/embedding-001",
-    task_type="retrieval_document",
-    api_key=os.getenv('GOOGLE_API_KEY')
+# wrapped in a CachedEmbedder, so chunks and questions embedded before are read from disk
+# and new chunks are sent to Gemini in batches instead of one request each
+embedder = CachedEmbedder(
+    embedder=GeminiEmbedder(
+        model="models/embedding-001",
+        task_type="retrieval_document",
+        api_key=os.getenv('GOOGLE_API_KEY')
+    ),
+    cache_dir="embedding_cache"
 )
 
 # We need to manually add the embedder parameter to the database, as by default it assumes OpenAI embedder.
@@ -38,17 +47,35 @@ knowledge_base = PDFKnowledgeBase(
     vector_db=ChromaDb(
         collection="attention_paper",
         path=vector_db_path,
+        # persistent, so the embedded chunks survive a restart instead of living in memory
+        persistent_client=True,
         embedder=embedder
     )
 )
 
 print("Loading knowledge base...")
-knowledge_base.load(upsert=True)
-print("Knowledge base loaded successfully")
+# Only new or changed PDFs are parsed and only chunks that are not in the vector db yet are embedded,
+# the manifest remembers what was loaded before. knowledge_base.load(upsert=True) would embed everything again.
+# The keyword index is filled at the same time, for the hybrid search below
+keyword_index = KeywordIndex(os.path.join(vector_db_path, "keywords.db"))
+stats = incremental_load(knowledge_base, os.path.join(vector_db_path, "manifest.json"), keyword_index=keyword_index)
+print(f"Knowledge base loaded successfully: {stats['parsed']} of {stats['files']} PDFs parsed, {stats['embedded']} chunks embedded")
+
+# Vector search alone misses exact-term questions like "multi-head attention equation", so the agent
+# searches with BM25 and vectors together, merged by reciprocal rank fusion. On the offline eval
+# (python eval_retrieval.py --synthetic) hybrid recall@5 is 0.81 against 0.75 for BM25 and 0.38 for
+# vectors; run python eval_retrieval.py on Attention_paper.pdf to check it with the Gemini embedder.
+# Pass reranker=CrossEncoderReranker() (from hybrid_search) to rerank the merged results with a cross-encoder.
+hybrid = HybridRetriever(knowledge_base, keyword_index)
+# Repeated or reworded questions are answered from the cache, without embedding the question or searching again.
+# Any write to the collection empties it, including loads by another process that update the manifest.
+retrieval_cache = RetrievalCache(hybrid.search, knowledge_base.vector_db,
+                                 manifest_path=os.path.join(vector_db_path, "manifest.json"))
 
 agent = Agent(
     model=Gemini(id="gemini-1.5-pro"), 
     knowledge_base=knowledge_base,
+    retriever=retrieval_cache.retriever,
     add_context=True,
     search_knowledge=True,
     read_chat_history=True,
@@ -72,5 +99,6 @@ agent = Agent(
 
 agent.print_response("What is this paper about? Give a brief summary.", stream=True)
 agent.print_response("What was my last question?", markdown=True)
+print(f"Retrieval cache: {retrieval_cache.stats()}")
 
 
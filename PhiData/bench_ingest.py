@@ -0,0 +1,121 @@
+# Benchmark of loading a directory of PDFs into the knowledge base, cold and after a restart.
+#
+# Generates N small text PDFs, then times
+#   - knowledge_base.load(upsert=True), as the RAG scripts did on every start
+#   - incremental_load() on an empty vector db (cold) and again with nothing changed (warm)
+#   - incremental_load() after editing a few PDFs
+# The embedder is a local hashing embedder with a configurable delay per call standing in for the
+# Gemini API, so the run is offline and the embedding calls are counted. --cached puts the
+# incremental loads behind a CachedEmbedder, which embeds new chunks in batches.
+#
+#   python bench_ingest.py --pdfs 500 --embed-latency 0.02 [--cached]
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from phi.knowledge.pdf import PDFKnowledgeBase
+from phi.vectordb.chroma import ChromaDb
+from phi.utils.log import logger
+
+from embedding_cache import CachedEmbedder, LocalEmbedder
+from rag_ingest import incremental_load
+
+WORDS = ("attention transformer encoder decoder layer head query key value softmax embedding position "
+         "sequence token training model translation residual normalization dropout vector matrix").split()
+
+
+def write_pdf(path, pages):
+    """Writes a minimal PDF with one page of Helvetica text per item of pages (a list of lines)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        text = "".join(f"({line.replace(chr(92), '').replace('(', '').replace(')', '')}) '\n" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td\n{text}ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as file:
+        file.write(output)
+
+
+def random_pages(rng, count, lines=50):
+    return [[" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines)] for _ in range(count)]
+
+
+def knowledge_base(pdf_dir, db_dir, embedder):
+    return PDFKnowledgeBase(
+        path=pdf_dir,
+        vector_db=ChromaDb(collection="bench", path=db_dir, persistent_client=True, embedder=embedder),
+    )
+
+
+def timed(label, embedder, load):
+    embedder.calls = 0
+    start = time.perf_counter()
+    stats = load()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.2f} s  {embedder.calls:6d} embedding calls  {stats or ''}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdfs", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=3, help="pages per PDF")
+    parser.add_argument("--edited", type=int, default=5, help="PDFs changed before the last run")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="seconds per embedding call")
+    parser.add_argument("--cached", action="store_true", help="embed through a CachedEmbedder in the incremental loads")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+
+    folder = tempfile.mkdtemp(prefix="bench_ingest_")
+    try:
+        rng = random.Random(0)
+        pdf_dir = os.path.join(folder, "pdfs")
+        os.makedirs(pdf_dir)
+        papers = [random_pages(rng, args.pages) for _ in range(args.pdfs)]
+        for index, pages in enumerate(papers):
+            write_pdf(os.path.join(pdf_dir, f"paper_{index:04d}.pdf"), pages)
+        embedder = LocalEmbedder(embed_latency=args.embed_latency)
+        print(f"{args.pdfs} PDFs of {args.pages} pages, {args.embed_latency * 1000:.0f} ms per embedding call\n")
+
+        baseline = knowledge_base(pdf_dir, os.path.join(folder, "baseline_db"), embedder)
+        full = timed("load(upsert=True), every start", embedder, lambda: baseline.load(upsert=True))
+
+        manifest = os.path.join(folder, "db", "manifest.json")
+        os.makedirs(os.path.dirname(manifest))
+        counted = embedder
+        if args.cached:
+            embedder = CachedEmbedder(embedder=counted, cache_dir=os.path.join(folder, "embedding_cache"))
+        cold = timed("incremental_load, cold", counted,
+                     lambda: incremental_load(knowledge_base(pdf_dir, os.path.join(folder, "db"), embedder), manifest))
+        warm = timed("incremental_load, warm restart", counted,
+                     lambda: incremental_load(knowledge_base(pdf_dir, os.path.join(folder, "db"), embedder), manifest))
+        for index in rng.sample(range(args.pdfs), min(args.edited, args.pdfs)):
+            # Keep the first pages and rewrite the last one, like an edited paper
+            write_pdf(os.path.join(pdf_dir, f"paper_{index:04d}.pdf"), papers[index][:-1] + random_pages(rng, 1))
+        edited = timed(f"incremental_load, {args.edited} edited", counted,
+                       lambda: incremental_load(knowledge_base(pdf_dir, os.path.join(folder, "db"), embedder), manifest))
+        print(f"\nwarm restart is {full / max(warm, 1e-9):.0f}x faster than load(upsert=True); "
+              f"cold {cold:.2f} s, warm {warm:.3f} s, edited {edited:.2f} s")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Benchmark of the parallel ingestion pipeline in rag_ingest.py: pages per second and peak memory
+# of a cold load for several worker counts, against knowledge_base.load(upsert=True).
+#
+# Every load runs in its own process on a fresh vector db, so the peak RSS of one run does not
+# leak into the next. The largest worker count also loads a corpus a quarter of the size: with
+# bounded stages its peak RSS should be about the same.
+#
+#   python bench_pipeline.py --pdfs 400 --pages 10 --workers 1 2 4 8
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from phi.utils.log import logger
+from pypdf import PdfReader
+
+from bench_ingest import knowledge_base, random_pages, write_pdf
+from embedding_cache import LocalEmbedder
+from rag_ingest import incremental_load, pdf_paths
+
+
+def run(pdf_dir, workers, embed_latency):
+    """Child process: one cold load, printed as JSON."""
+    logger.setLevel("WARNING")
+    folder = tempfile.mkdtemp(prefix="bench_pipeline_db_")
+    try:
+        embedder = LocalEmbedder(embed_latency=embed_latency)
+        base = knowledge_base(pdf_dir, folder, embedder)
+        start = time.perf_counter()
+        if workers == 0:
+            base.load(upsert=True)
+            elapsed = time.perf_counter() - start
+            pages = sum(len(PdfReader(pdf).pages) for pdf in pdf_paths(pdf_dir))
+        else:
+            pages = incremental_load(base, os.path.join(folder, "manifest.json"), workers=workers)["pages"]
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print(json.dumps({
+        "seconds": elapsed,
+        "pages": pages,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }))
+
+
+def measure(pdf_dir, workers, embed_latency):
+    output = subprocess.run([sys.executable, __file__, "--run", pdf_dir, "--workers", str(workers),
+                             "--embed-latency", str(embed_latency)],
+                            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdfs", type=int, default=400)
+    parser.add_argument("--pages", type=int, default=10, help="pages per PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="seconds per embedding call")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(args.run, args.workers[0], args.embed_latency)
+        return
+
+    folder = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        rng = random.Random(0)
+        full, quarter = os.path.join(folder, "full"), os.path.join(folder, "quarter")
+        os.makedirs(full)
+        os.makedirs(quarter)
+        for index in range(args.pdfs):
+            pages = random_pages(rng, args.pages)
+            write_pdf(os.path.join(full, f"paper_{index:04d}.pdf"), pages)
+            if index < args.pdfs // 4:
+                write_pdf(os.path.join(quarter, f"paper_{index:04d}.pdf"), pages)
+        print(f"{args.pdfs} PDFs of {args.pages} pages on {os.cpu_count()} cores, "
+              f"{args.embed_latency * 1000:.0f} ms per embedding call\n")
+        print(f"{'load':<40} {'pages/s':>9} {'speedup':>8} {'main RSS':>10} {'worker RSS':>11}")
+
+        def report(label, result, serial):
+            rate = result["pages"] / result["seconds"]
+            print(f"{label:<40} {rate:9.1f} {rate / serial if serial else 1:7.2f}x "
+                  f"{result['rss_mb']:8.1f} MB {result['worker_rss_mb']:8.1f} MB")
+            return rate
+
+        serial = report("load(upsert=True)", measure(full, 0, args.embed_latency), None)
+        for workers in sorted(set(args.workers)):
+            report(f"incremental_load, {workers} workers", measure(full, workers, args.embed_latency), serial)
+        workers = max(args.workers)
+        report(f"incremental_load, {workers} workers, 1/4 PDFs", measure(quarter, workers, args.embed_latency), serial)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Benchmark of RetrievalCache in front of the hybrid search: latency of first questions, the same
+# questions asked again, reworded questions, and questions after the collection changes through
+# incremental_load, through ChromaDb.upsert, and from another process.
+#
+# Runs offline on the synthetic corpus of eval_retrieval.py, with a local embedder that sleeps
+# --embed-latency per call like the Gemini API does, behind a CachedEmbedder as in the scripts.
+#
+#   python bench_retrieval_cache.py --embed-latency 0.1
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from phi.document import Document
+from phi.knowledge.pdf import PDFKnowledgeBase
+from phi.vectordb.chroma import ChromaDb
+from phi.utils.log import logger
+
+from bench_ingest import random_pages, write_pdf
+from embedding_cache import CachedEmbedder, LocalEmbedder
+from eval_retrieval import EVAL_SET, synthetic_corpus
+from hybrid_search import HybridRetriever, KeywordIndex
+from rag_ingest import incremental_load
+from retrieval_cache import RetrievalCache
+
+
+def ask_all(label, cache, queries):
+    before = cache.stats()
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        cache.search(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    after = cache.stats()
+    print(f"{label:<32} p50 {latencies[len(latencies) // 2] * 1000:8.2f} ms   max {latencies[-1] * 1000:8.2f} ms   "
+          f"hits {after['hits'] - before['hits']:3d}   neighbour hits {after['neighbour_hits'] - before['neighbour_hits']:3d}   "
+          f"misses {after['misses'] - before['misses']:3d}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embed-latency", type=float, default=0.1, help="seconds per embedding call")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+
+    with open(EVAL_SET) as file:
+        items = json.load(file)
+    queries = [item["query"] for item in items]
+    folder = tempfile.mkdtemp(prefix="bench_retrieval_cache_")
+    try:
+        pdf_dir = os.path.join(folder, "pdfs")
+        os.makedirs(pdf_dir)
+        synthetic_corpus(os.path.join(pdf_dir, "paper.pdf"), items)
+        # Behind a CachedEmbedder like in the RAG scripts, so a missed question is embedded once, not twice
+        embedder = CachedEmbedder(embedder=LocalEmbedder(embed_latency=args.embed_latency),
+                                  cache_dir=os.path.join(folder, "embedding_cache"))
+        knowledge_base = PDFKnowledgeBase(
+            path=pdf_dir,
+            vector_db=ChromaDb(collection="bench", path=folder, persistent_client=True, embedder=embedder),
+        )
+        keyword_index = KeywordIndex(os.path.join(folder, "keywords.db"))
+        manifest = os.path.join(folder, "manifest.json")
+        incremental_load(knowledge_base, manifest, keyword_index=keyword_index)
+        cache = RetrievalCache(HybridRetriever(knowledge_base, keyword_index).search, knowledge_base.vector_db,
+                               manifest_path=manifest)
+        print(f"{len(queries)} questions, {args.embed_latency * 1000:.0f} ms per embedding call\n")
+
+        ask_all("first ask", cache, queries)
+        ask_all("asked again (case, punctuation)", cache, [f"  {query.upper()} ?!" for query in queries])
+        # The local embedder is a bag of words, so reversing the words is a perfect paraphrase for it
+        ask_all("reworded", cache, [" ".join(reversed(query.split())) for query in queries])
+        write_pdf(os.path.join(pdf_dir, "appendix.pdf"), random_pages(random.Random(1), 2))
+        incremental_load(knowledge_base, manifest, keyword_index=keyword_index)
+        ask_all("after loading a new PDF", cache, queries)
+        ask_all("asked again", cache, queries)
+        knowledge_base.vector_db.upsert([Document(content="An upserted chunk about attention heads.")])
+        ask_all("after ChromaDb.upsert", cache, queries)
+        # Another process adds a chunk without touching this process's version; the cache sees the new
+        # chunk count once check_interval has passed since its last check
+        dimensions = len(embedder.get_embedding("attention"))
+        subprocess.run([sys.executable, "-c", (
+            "import chromadb; chromadb.PersistentClient(path=%r).get_collection('bench')"
+            ".add(ids=['other-process'], documents=['A chunk from another process.'], embeddings=[[0.1] * %d])"
+        ) % (folder, dimensions)], check=True)
+        time.sleep(cache.check_interval)
+        ask_all("after a write by another process", cache, queries)
+        ask_all("asked again", cache, queries)
+        print(f"\n{cache.stats()}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Disk backed embedding cache for the phi embedders used by the RAG scripts.
+#
+# CachedEmbedder wraps an embedder (GeminiEmbedder in the scripts) and keeps every vector it
+# computed, keyed on (model, task_type, sha256 of the text), so chunks and queries are embedded
+# once across runs and users. Vectors live in a memory mapped float32 file, one row per
+# entry, and a SQLite index maps keys to rows and evicts the least recently used rows when
+# the cache is full. Texts that are not cached are embedded in batches, one API call per
+# batch_size texts instead of one per text.
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import PrivateAttr
+
+from phi.embedder.base import Embedder
+from phi.utils.log import logger
+
+
+class EmbeddingCache:
+    """float32 vectors of one dimension in path.f32, indexed by key in path.db, with LRU eviction."""
+
+    def __init__(self, path, dimensions, capacity=100_000, initial_rows=1024):
+        self.dimensions = dimensions
+        self.capacity = capacity
+        self.vectors_path = path + ".f32"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path + ".db", check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER UNIQUE, used REAL);
+            CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used);
+        """)
+        self._rows = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        row_bytes = dimensions * 4
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        self._open(max(size // row_bytes, min(initial_rows, capacity), self._rows))
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self, rows):
+        # Growing the file and mapping it again keeps small caches small on disk
+        with open(self.vectors_path, "ab") as file:
+            if file.tell() < rows * self.dimensions * 4:
+                file.truncate(rows * self.dimensions * 4)
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dimensions))
+
+    def get_many(self, keys):
+        """Returns {key: vector} for the cached keys and marks them as recently used."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, row FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part).fetchall()
+                for key, row in rows:
+                    found[key] = np.array(self._vectors[row])
+            if found:
+                now = time.time()
+                self._db.executemany("UPDATE embeddings SET used = ? WHERE key = ?", [(now, key) for key in found])
+                self._db.commit()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Stores (key, vector) pairs, reusing the rows of the least recently used keys once the cache is full."""
+        with self._lock:
+            items = [(key, vector) for key, vector in items
+                     if self._db.execute("SELECT 1 FROM embeddings WHERE key = ?", (key,)).fetchone() is None]
+            rows = []
+            while len(rows) < len(items) and self._rows < self.capacity:
+                rows.append(self._rows)
+                self._rows += 1
+            if len(rows) < len(items):
+                evicted = self._db.execute("SELECT key, row FROM embeddings ORDER BY used LIMIT ?",
+                                           (len(items) - len(rows),)).fetchall()
+                self._db.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in evicted])
+                rows += [row for _, row in evicted]
+            if rows and max(rows) >= len(self._vectors):
+                self._vectors.flush()
+                self._open(min(self.capacity, max(max(rows) + 1, len(self._vectors) * 2)))
+            for (key, vector), row in zip(items, rows):
+                self._vectors[row] = vector
+            self._vectors.flush()
+            now = time.time()
+            self._db.executemany("INSERT INTO embeddings (key, row, used) VALUES (?, ?, ?)",
+                                 [(key, row, now) for (key, _), row in zip(items, rows)])
+            self._db.commit()
+
+    def __len__(self):
+        return self._rows
+
+
+def embed_batch(embedder, texts):
+    """Embeds texts with as few API calls as the embedder allows."""
+    if hasattr(embedder, "get_embeddings"):
+        return embedder.get_embeddings(texts)
+    if type(embedder).__name__ == "GeminiEmbedder":
+        # embed_content takes a list of texts and returns one embedding per text
+        request = {"content": texts, "model": embedder.model, "output_dimensionality": embedder.dimensions,
+                   "task_type": embedder.task_type, "title": embedder.title}
+        request.update(embedder.request_params or {})
+        return embedder.client.embed_content(**request)["embedding"]
+    return [embedder.get_embedding(text) for text in texts]
+
+
+class CachedEmbedder(Embedder):
+    """Embedder that serves repeated texts from an EmbeddingCache and embeds the rest in batches."""
+
+    embedder: Embedder
+    cache_dir: str = "embedding_cache"
+    capacity: int = 100_000
+    batch_size: int = 100
+
+    _cache: Optional[EmbeddingCache] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self.dimensions = self.embedder.dimensions
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._cache = EmbeddingCache(os.path.join(self.cache_dir, f"embeddings_{self.dimensions}"),
+                                     self.dimensions, self.capacity)
+
+    @property
+    def model(self):
+        return getattr(self.embedder, "model", None)
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def key(self, text):
+        task_type = getattr(self.embedder, "task_type", "")
+        return hashlib.sha256(f"{self.model}\0{task_type}\0{text}".encode()).hexdigest()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.key(text) for text in texts]
+        found = self._cache.get_many(list(set(keys)))
+        missing = list({key: text for key, text in zip(keys, texts) if key not in found}.items())
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            try:
+                vectors = embed_batch(self.embedder, [text for _, text in batch])
+            except Exception as e:
+                logger.warning(f"Error embedding a batch of {len(batch)} texts: {e}")
+                continue
+            vectors = [np.asarray(vector, dtype=np.float32) for vector in vectors]
+            self._cache.put_many([(key, vector) for (key, _), vector in zip(batch, vectors)
+                                  if vector.shape == (self.dimensions,)])
+            found.update({key: vector for (key, _), vector in zip(batch, vectors)})
+        return [found[key].tolist() if key in found else [] for key in keys]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+class LocalEmbedder(Embedder):
+    """Offline stand-in for GeminiEmbedder: deterministic hashed bag of words vectors.
+
+    embed_latency is slept per call, single or batched, to behave like a remote embedding API,
+    and calls and texts count what a remote API would have been asked for.
+    """
+
+    model: str = "local-hashing"
+    task_type: str = "retrieval_document"
+    dimensions: Optional[int] = 256
+    embed_latency: float = 0.0
+    calls: int = 0
+    texts: int = 0
+
+    def _vector(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimensions] += 1.0
+        norm = float(np.linalg.norm(vector)) or 1.0
+        return (vector / norm).tolist()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        self.texts += len(texts)
+        if self.embed_latency:
+            time.sleep(self.embed_latency)
+        return [self._vector(text) for text in texts]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
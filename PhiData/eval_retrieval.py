@@ -0,0 +1,119 @@
+# Retrieval eval for the Attention-paper knowledge base: recall@k and per-query latency of vector
+# search, BM25, hybrid (reciprocal rank fusion) and, with --reranker, hybrid + cross-encoder.
+#
+# retrieval_eval.json holds the questions and, for each, phrases the relevant chunk contains
+# (compared lowercased and without whitespace, since PDF text extraction spaces formulas
+# unpredictably). A query counts as recalled when one of the top k chunks contains a phrase.
+#
+#   python eval_retrieval.py --pdf Attention_paper.pdf --embedder gemini --k 5
+#
+# Without the PDF (or with --synthetic) the eval builds a local corpus from the passages in the
+# eval set mixed with filler pages, so it runs offline with the local embedder; that run checks
+# the plumbing more than the ranking quality.
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+
+from phi.document import Document
+from phi.embedder.google import GeminiEmbedder
+from phi.knowledge.pdf import PDFKnowledgeBase
+from phi.vectordb.chroma import ChromaDb
+from phi.utils.log import logger
+
+from bench_ingest import WORDS, write_pdf
+from embedding_cache import CachedEmbedder, LocalEmbedder
+from hybrid_search import CrossEncoderReranker, HybridRetriever, KeywordIndex
+from rag_ingest import incremental_load
+
+EVAL_SET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_eval.json")
+
+
+def normalize(text):
+    return re.sub(r"\s+", "", text.lower())
+
+
+def synthetic_corpus(path, items, filler_pages=40):
+    rng = random.Random(0)
+
+    def filler(lines):
+        return [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines)]
+
+    pages = [filler(20) + [item["passage"]] + filler(20) for item in items]
+    pages += [filler(41) for _ in range(filler_pages)]
+    rng.shuffle(pages)
+    # write_pdf puts one line per text line, so long passages are wrapped
+    pages = [[part for line in page for part in re.findall(r".{1,90}(?:\s|$)", line)] for page in pages]
+    write_pdf(path, pages)
+
+
+def evaluate(name, search, items, k):
+    recalled, latencies = 0, []
+    for item in items:
+        start = time.perf_counter()
+        documents = search(item["query"], k)
+        latencies.append(time.perf_counter() - start)
+        texts = [normalize(document.content) for document in documents[:k]]
+        if any(normalize(phrase) in text for phrase in item["expected"] for text in texts):
+            recalled += 1
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+    print(f"{name:<22} recall@{k} {recalled / len(items):6.2f}   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf", default="Attention_paper.pdf")
+    parser.add_argument("--synthetic", action="store_true", help="use the local corpus even if the PDF exists")
+    parser.add_argument("--embedder", choices=["gemini", "local"], default=None,
+                        help="gemini for the real PDF, local for the synthetic corpus by default")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--reranker", action="store_true", help="also evaluate a cross-encoder reranker")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+
+    with open(EVAL_SET) as file:
+        items = json.load(file)
+    folder = tempfile.mkdtemp(prefix="eval_retrieval_")
+    try:
+        pdf = args.pdf
+        if args.synthetic or not os.path.exists(pdf):
+            pdf = os.path.join(folder, "synthetic_paper.pdf")
+            synthetic_corpus(pdf, items)
+            print(f"Using a synthetic corpus ({args.pdf} not used)")
+        if (args.embedder or ("gemini" if pdf == args.pdf else "local")) == "gemini":
+            # Cached like in the RAG scripts, so running the eval again does not embed the paper again
+            embedder = CachedEmbedder(
+                embedder=GeminiEmbedder(model="models/embedding-001", task_type="retrieval_document"),
+                cache_dir="embedding_cache"
+            )
+        else:
+            embedder = LocalEmbedder()
+        knowledge_base = PDFKnowledgeBase(
+            path=pdf,
+            vector_db=ChromaDb(collection="eval", path=folder, persistent_client=True, embedder=embedder),
+        )
+        keyword_index = KeywordIndex(os.path.join(folder, "keywords.db"))
+        stats = incremental_load(knowledge_base, os.path.join(folder, "manifest.json"), keyword_index=keyword_index)
+        print(f"{stats['chunks']} chunks from {stats['pages']} pages, {len(items)} queries\n")
+
+        hybrid = HybridRetriever(knowledge_base, keyword_index)
+        evaluate("vector", lambda query, k: knowledge_base.vector_db.search(query=query, limit=k), items, args.k)
+        evaluate("bm25", lambda query, k: [Document(id=chunk_id, content=content)
+                                            for chunk_id, content, _ in keyword_index.search(query, k)], items, args.k)
+        evaluate("hybrid (rrf)", hybrid.search, items, args.k)
+        if args.reranker:
+            reranked = HybridRetriever(knowledge_base, keyword_index, reranker=CrossEncoderReranker())
+            evaluate("hybrid + cross-encoder", reranked.search, items, args.k)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
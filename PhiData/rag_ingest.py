@@ -0,0 +1,339 @@
+# Incremental loading for the PDF knowledge bases used in agentic_rag.py and traditional_rag.py.
+#
+# knowledge_base.load(upsert=True) parses, chunks and embeds every PDF again on every start, one
+# page after the other. incremental_load() keeps a manifest next to the vector db with the sha256
+# of every loaded PDF and the ids of its chunks, so a restart only stats the files, a changed PDF
+# is parsed again but only its new chunks are embedded, and chunks of removed or edited PDFs are
+# deleted. The PDFs that do need parsing go through a pipeline with a bounded queue between each
+# stage: page extraction in worker processes, chunking, batched embedding and bulk upserts.
+
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from phi.utils.log import logger
+
+from embedding_cache import CachedEmbedder, embed_batch
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(document):
+    # The same id ChromaDb gives the chunk (md5 of the cleaned content), so manifest and collection agree
+    return hashlib.md5(document.content.replace("\x00", "\ufffd").encode()).hexdigest()
+
+
+def chunk_metadata(document):
+    """The chunk's source PDF name and reader metadata (page, chunk), as the flat scalar dict Chroma accepts.
+
+    Returns None when there is nothing to store, since Chroma rejects empty metadata.
+    """
+    metadata = {"name": document.name, **(document.meta_data or {})}
+    return {key: value for key, value in metadata.items() if isinstance(value, (str, int, float, bool))} or None
+
+
+def pdf_paths(path):
+    """The PDFs PDFKnowledgeBase.document_lists would read for this path, in a stable order."""
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob("**/*.pdf"))
+    if path.is_file() and path.suffix == ".pdf":
+        return [path]
+    return []
+
+
+def embedder_name(vector_db):
+    embedder = vector_db.embedder
+    if isinstance(embedder, CachedEmbedder):
+        # Adding or removing the cache does not change the vectors
+        embedder = embedder.embedder
+    return f"{type(embedder).__name__}:{getattr(embedder, 'model', '')}:{getattr(embedder, 'dimensions', '')}"
+
+
+class IngestManifest:
+    """JSON record of every loaded PDF: size, mtime, sha256 and the chunk ids it put in the vector db."""
+
+    def __init__(self, path):
+        self.path = path
+        self.embedder = None
+        self.files = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            self.embedder = data.get("embedder")
+            self.files = data.get("files", {})
+
+    def chunk_ids(self):
+        return {chunk for entry in self.files.values() for chunk in entry["chunks"]}
+
+    def save(self):
+        # Written to a temporary file first, so an interrupted load never leaves a broken manifest
+        with open(self.path + ".tmp", "w") as file:
+            json.dump({"embedder": self.embedder, "files": self.files}, file)
+        os.replace(self.path + ".tmp", self.path)
+
+
+# Bumped on every write to a collection made in this process, by the helpers below and by the
+# vector db methods wrapped with track_writes, so cached search results can tell they are stale
+_collection_versions = {}
+
+
+def collection_version(vector_db):
+    return _collection_versions.get((os.path.abspath(vector_db.path), vector_db.collection), 0)
+
+
+def collection_changed(vector_db):
+    key = (os.path.abspath(vector_db.path), vector_db.collection)
+    _collection_versions[key] = _collection_versions.get(key, 0) + 1
+
+
+def track_writes(vector_db):
+    """Wraps the write methods of vector_db (as used by knowledge_base.load) so each call bumps its version."""
+    if getattr(vector_db, "_tracks_writes", False):
+        return vector_db
+    for name in ("insert", "upsert", "delete", "drop"):
+        method = getattr(vector_db, name)
+
+        @functools.wraps(method)
+        def tracked(*args, _method=method, **kwargs):
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                collection_changed(vector_db)
+
+        setattr(vector_db, name, tracked)
+    vector_db._tracks_writes = True
+    return vector_db
+
+
+def collection_state(vector_db, manifest_path=None):
+    """What a write from another process leaves behind: the chunk count and the mtime of the manifest."""
+    try:
+        count = vector_db.client.get_collection(name=vector_db.collection).count()
+    except Exception:
+        count = 0
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns if manifest_path else None
+    except OSError:
+        mtime = None
+    return count, mtime
+
+
+def delete_chunks(vector_db, ids):
+    # phi's ChromaDb only drops whole collections, so stale chunks are deleted on the chroma collection itself
+    if ids:
+        vector_db.client.get_collection(name=vector_db.collection).delete(ids=list(ids))
+        collection_changed(vector_db)
+
+
+def upsert_embedded(vector_db, ids, contents, embeddings, metadatas=None):
+    # One bulk upsert of chunks embedded beforehand; ChromaDb.upsert would embed them again one by one
+    # (and drop their metadata, which is kept here for the citations of hybrid_search)
+    vector_db.client.get_collection(name=vector_db.collection).upsert(
+        ids=ids, embeddings=embeddings, documents=contents, metadatas=metadatas)
+    collection_changed(vector_db)
+
+
+def read_pages(pdf, reader, known_sha256):
+    """Process pool stage: hashes the PDF and, if it changed, extracts its pages (unchunked)."""
+    digest = file_hash(pdf)
+    if digest == known_sha256:
+        return digest, None
+    return digest, reader.read(pdf=pdf)
+
+
+def bounded_map(pool, function, items, window):
+    """Like pool.map, in order, but with at most window items in flight so results never pile up in memory."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(function, *item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def chunk_pages(reader, pages):
+    """Generator stage: splits the pages into chunks the way the reader would have."""
+    for page in pages:
+        if reader.chunk:
+            yield from reader.chunk_document(page)
+        else:
+            yield page
+
+
+class ChunkWriter(threading.Thread):
+    """Embeds and upserts chunk batches from a bounded queue and records finished PDFs in the manifest.
+
+    Each batch carries the PDFs whose last chunk is in it, so a PDF is only recorded once all of its
+    chunks are in the vector db; an interrupted load loses at most the PDFs of unwritten batches.
+    """
+
+    def __init__(self, vector_db, manifest, keyword_index=None, queue_size=2, save_every=50):
+        super().__init__(daemon=True)
+        self.vector_db = vector_db
+        self.keyword_index = keyword_index
+        self.manifest = manifest
+        self.save_every = save_every
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self._recorded = 0
+
+    def run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            if self.error is not None:
+                # Keep draining so the producer never blocks on a dead writer
+                continue
+            try:
+                self.write(*batch)
+            except Exception as e:
+                self.error = e
+
+    def write(self, chunks, files):
+        if chunks:
+            ids = [chunk for chunk, _, _ in chunks]
+            contents = [content for _, content, _ in chunks]
+            metadatas = [metadata for _, _, metadata in chunks]
+            embeddings = embed_batch(self.vector_db.embedder, contents)
+            if any(len(embedding) == 0 for embedding in embeddings):
+                raise RuntimeError(f"Embedding a batch of {len(chunks)} chunks failed")
+            upsert_embedded(self.vector_db, ids, contents, [list(e) for e in embeddings], metadatas)
+            if self.keyword_index is not None:
+                self.keyword_index.upsert(ids, contents, metadatas)
+        for key, entry in files:
+            self.manifest.files[key] = entry
+        self._recorded += len(files)
+        if self._recorded >= self.save_every:
+            self._recorded = 0
+            self.manifest.save()
+
+
+def backfill_keyword_index(vector_db, keyword_index, page_size=1000):
+    # Indexes the chunks already in the collection, for a keyword index added after they were loaded
+    collection = vector_db.client.get_collection(name=vector_db.collection)
+    for offset in range(0, collection.count(), page_size):
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        keyword_index.upsert(page["ids"], page["documents"], page["metadatas"])
+
+
+def incremental_load(knowledge_base, manifest_path, workers=None, batch_size=100, save_every=50, keyword_index=None):
+    """Loads knowledge_base.path into its vector db, skipping unchanged PDFs and chunks already embedded.
+
+    Changed PDFs stream through a pipeline: pages are extracted in a pool of worker processes,
+    chunked by a generator, embedded in batches of batch_size and upserted in bulk by a writer
+    thread. Every stage is bounded (workers * 2 PDFs in flight, 2 batches queued), so memory does
+    not grow with the number of PDFs. workers defaults to the number of cores.
+
+    keyword_index (a hybrid_search.KeywordIndex) is kept in step with the vector db, for hybrid search.
+
+    Returns a dict with the number of files seen, skipped and parsed, of pages, and of chunks
+    embedded and deleted.
+    """
+    vector_db = knowledge_base.vector_db
+    reader = knowledge_base.reader
+    manifest = IngestManifest(manifest_path)
+    vector_db.create()
+    if manifest.embedder != embedder_name(vector_db) or vector_db.get_count() == 0:
+        # A new embedder or an emptied collection means nothing recorded in the manifest can be trusted
+        if manifest.files:
+            logger.info("Vector db or embedder changed, loading every PDF again")
+        manifest.files = {}
+        manifest.embedder = embedder_name(vector_db)
+        if keyword_index is not None:
+            keyword_index.clear()
+    elif keyword_index is not None and len(keyword_index) == 0:
+        backfill_keyword_index(vector_db, keyword_index)
+
+    stats = {"files": 0, "unchanged": 0, "parsed": 0, "pages": 0, "chunks": 0, "embedded": 0, "deleted": 0}
+    known = manifest.chunk_ids()
+    changed = []
+    paths = pdf_paths(knowledge_base.path)
+    for pdf in paths:
+        stat = pdf.stat()
+        entry = manifest.files.get(str(pdf))
+        stats["files"] += 1
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            stats["unchanged"] += 1
+        else:
+            changed.append((pdf, stat, entry))
+    removed = set(manifest.files) - {str(pdf) for pdf in paths}
+
+    workers = workers or os.cpu_count() or 1
+    # Worker processes are forked: spawning would run the calling script again in every worker
+    if workers > 1 and len(changed) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+        # Workers are only forked on the first submit. Forking them all now, before the writer
+        # thread starts, means no child inherits a lock held by another thread of this process
+        pool.submit(int).result()
+    else:
+        pool = None
+    page_reader = reader.model_copy(update={"chunk": False})
+    jobs = [(pdf, page_reader, entry["sha256"] if entry else None) for pdf, _, entry in changed]
+    results = bounded_map(pool, read_pages, jobs, workers * 2) if pool else (read_pages(*job) for job in jobs)
+
+    writer = ChunkWriter(vector_db, manifest, keyword_index, save_every=save_every)
+    writer.start()
+    stale = set()
+    chunks, files = [], []
+    try:
+        for (pdf, stat, entry), (digest, pages) in zip(changed, results):
+            if writer.error is not None:
+                break
+            record = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": digest, "chunks": []}
+            if pages is None:
+                # Touched but not modified
+                record["chunks"] = entry["chunks"]
+                stats["unchanged"] += 1
+            else:
+                stats["parsed"] += 1
+                stats["pages"] += len(pages)
+                for chunk in chunk_pages(reader, pages):
+                    chunk_key = chunk_id(chunk)
+                    record["chunks"].append(chunk_key)
+                    if chunk_key not in known:
+                        known.add(chunk_key)
+                        chunks.append((chunk_key, chunk.content.replace("\x00", "\ufffd"), chunk_metadata(chunk)))
+                        stats["embedded"] += 1
+                    if len(chunks) >= batch_size:
+                        writer.queue.put((chunks, files))
+                        chunks, files = [], []
+                stats["chunks"] += len(record["chunks"])
+                if entry:
+                    stale.update(set(entry["chunks"]) - set(record["chunks"]))
+            files.append((str(pdf), record))
+        writer.queue.put((chunks, files))
+    finally:
+        writer.queue.put(None)
+        writer.join()
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        manifest.save()
+    if writer.error is not None:
+        raise writer.error
+
+    for key in removed:
+        stale.update(manifest.files.pop(key)["chunks"])
+    # Identical chunks in different PDFs share one id, so only ids no remaining PDF uses are deleted
+    stale -= manifest.chunk_ids()
+    delete_chunks(vector_db, stale)
+    if keyword_index is not None and stale:
+        keyword_index.delete(stale)
+    stats["deleted"] = len(stale)
+    manifest.save()
+    return stats
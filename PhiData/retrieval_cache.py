@@ -0,0 +1,118 @@
+# Cache of knowledge search results for the RAG agents.
+#
+# With add_references or search_knowledge every question runs a knowledge search: one query
+# embedding call plus the vector (and keyword) search. RetrievalCache answers a repeated
+# question from memory by its normalized text, without embedding it, and a paraphrased one
+# by the cached question whose embedding is nearest, if it is similar enough.
+#
+# The cache empties itself when the collection changes. Writes in this process (incremental_load,
+# knowledge_base.load or any other call of the vector db's write methods) bump its version and are
+# seen on the next lookup. Writes from other processes are seen from the chunk count and the mtime
+# of the ingest manifest, checked at most every check_interval seconds.
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from rag_ingest import collection_state, collection_version, track_writes
+
+
+def normalize_query(query):
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+
+class RetrievalCache:
+    """LRU cache in front of search(query, num_documents) -> List[Document], with hit and miss counters."""
+
+    def __init__(self, search, vector_db, max_entries=256, similarity=0.97, manifest_path=None, check_interval=1.0):
+        self._search = search
+        self.vector_db = track_writes(vector_db)
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.manifest_path = manifest_path
+        self.check_interval = check_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = self._current_version()
+        self._checked = time.monotonic()
+        self.hits = 0
+        self.neighbour_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _current_version(self):
+        return (collection_version(self.vector_db),) + collection_state(self.vector_db, self.manifest_path)
+
+    def _check_version(self):
+        # The in-process version is free to read; the collection and manifest only every check_interval
+        now = time.monotonic()
+        if collection_version(self.vector_db) == self._version[0] and now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        version = self._current_version()
+        if version != self._version:
+            self._version = version
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _nearest(self, embedding, num_documents):
+        best, best_similarity = None, self.similarity
+        for key, (cached_embedding, _) in self._entries.items():
+            if key[1] != num_documents or cached_embedding is None:
+                continue
+            similarity = float(np.dot(embedding, cached_embedding))
+            if similarity >= best_similarity:
+                best, best_similarity = key, similarity
+        return best
+
+    def search(self, query, num_documents=None):
+        key = (normalize_query(query), num_documents)
+        with self._lock:
+            self._check_version()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(self._entries[key][1])
+        embedding = np.asarray(self.vector_db.embedder.get_embedding(query), dtype=np.float32)
+        norm = float(np.linalg.norm(embedding))
+        embedding = embedding / norm if norm else None
+        with self._lock:
+            nearest = self._nearest(embedding, num_documents) if embedding is not None else None
+            if nearest is not None:
+                self._entries.move_to_end(nearest)
+                self.neighbour_hits += 1
+                return list(self._entries[nearest][1])
+            self.misses += 1
+            version = self._version[0]
+        documents = self._search(query, num_documents)
+        with self._lock:
+            # Results of a search that overlapped a write to the collection are not kept
+            if collection_version(self.vector_db) == version:
+                self._entries[key] = (embedding, list(documents))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return documents
+
+    def retriever(self, agent=None, query="", num_documents=None, **kwargs):
+        """The Agent(retriever=...) hook: references for the query as dicts."""
+        documents = self.search(query, num_documents)
+        return [document.to_dict() for document in documents] or None
+
+    def stats(self):
+        lookups = self.hits + self.neighbour_hits + self.misses
+        return {
+            "hits": self.hits,
+            "neighbour_hits": self.neighbour_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.neighbour_hits) / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
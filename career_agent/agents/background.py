@@ -0,0 +1,51 @@
+"""
+Job queue handlers for tutorial and resume generation
+"""
+from functools import lru_cache
+from langchain_core.callbacks import BaseCallbackHandler
+from .learning_agent import LearningResourceAgent
+from .resume_agent import ResumeMaker
+from utils.archive import get_archive
+from utils.job_queue import register_job
+from config.settings import TUTORIAL_SYSTEM_MESSAGE, RESUME_SYSTEM_MESSAGE
+
+@lru_cache(maxsize=None)
+def _agent(agent_cls, system_message):
+    # One agent per worker process, shared by its worker threads like the UI shares its agents
+    return agent_cls(system_message)
+
+class ProgressHandler(BaseCallbackHandler):
+    """Passes the answer streamed so far to report(); text of earlier model steps (tool call planning) is dropped."""
+    run_inline = True
+
+    def __init__(self, report):
+        self.report = report
+        self.text = ""
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.text = ""
+
+    def on_llm_new_token(self, token, **kwargs):
+        if isinstance(token, str) and token:
+            self.text += token
+            self.report(self.text.replace("```markdown", ""))
+
+def generate(agent, user_input, kind, report, user=None):
+    """Streams the agent answer into report() and archives the final markdown.
+
+    Jobs run the sync executor on the worker thread. The shared model client caches its async
+    channel on the first event loop it runs on, so a throwaway loop per job would leave the
+    channel bound to a closed loop for every later call, the UI's included.
+    """
+    output = agent.run_agent(user_input, callbacks=[ProgressHandler(report)])
+    # Archived synchronously: the job is already off the request path, and a worker process may exit before a queued write
+    get_archive().put(output, kind, user, user_input)
+    return output
+
+@register_job("tutorial")
+def tutorial_job(payload, report):
+    return generate(_agent(LearningResourceAgent, TUTORIAL_SYSTEM_MESSAGE), payload["input"], 'Tutorial', report, payload.get("user"))
+
+@register_job("resume")
+def resume_job(payload, report):
+    return generate(_agent(ResumeMaker, RESUME_SYSTEM_MESSAGE), payload["input"], 'Resume', report, payload.get("user"))
@@ -1,24 +1,213 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from langchain_community.tools import DuckDuckGoSearchResults
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from .clients import get_chat_model, get_search_tools
+from .prompts import compile_agent_prompt
+from utils.file_handler import save_file
+from utils.response_cache import get_response_cache
+from utils.history import create_history_store
+from utils.token_budget import TokenBudgetTrimmer, model_summarizer
+from utils.tracing import tracer
+from config.settings import HISTORY_TOKEN_BUDGET, HISTORY_SUMMARIZE
 
 class BaseAgent:
+    # Executors are shared by every agent built on the same system message, model and tools,
+    # so prompt binding and tool schema serialization happen once instead of per click.
+    # The least recently used executors are dropped once the pool holds _executor_pool_size.
+    _executor_pool = OrderedDict()
+    _executor_pool_size = 64
+    _executor_lock = threading.Lock()
+    # Whether the answer to a similar (not identical) prompt may be reused from the response cache
+    similar_cache_hits = True
+
     def __init__(self, system_message):
-        self.model = ChatGoogleGenerativeAI(model="gemini-1.5-pro")
-        self.prompt = self.create_agent_prompt(system_message)
-        self.tools = [DuckDuckGoSearchResults()]
-        self.chat_history = []
+        # The model client, tools, prompt and executor are only built on first use,
+        # so constructing an agent for a tab nobody opens costs nothing.
+        self.system_message = system_message
+        self._model = None
+        self._tools = None
+        self._prompt = None
+        self.response_cache = get_response_cache()
+        # Conversations are kept per Gradio session so users never see each other's messages
+        self.history_store = create_history_store(hashlib.sha256(system_message.encode("utf-8")).hexdigest()[:16])
+        self.trimmer = TokenBudgetTrimmer(HISTORY_TOKEN_BUDGET, model_summarizer(lambda: self.model) if HISTORY_SUMMARIZE else None)
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_chat_model()
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    @property
+    def tools(self):
+        if self._tools is None:
+            self._tools = get_search_tools()
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools):
+        self._tools = tools
+
+    @property
+    def prompt(self):
+        if self._prompt is None:
+            self._prompt = self.create_agent_prompt(self.system_message)
+        return self._prompt
 
     def create_agent_prompt(self, system_message: str):
-        return ChatPromptTemplate.from_messages([
-            ("system", system_message),
-            ("human", "{input}"),
-            MessagesPlaceholder(variable_name="chat_history", optional=True),
-            ("human", "{agent_scratchpad}")
-        ])
+        return compile_agent_prompt(system_message)
+
+    @property
+    def agent_executor(self):
+        """Returns the pooled AgentExecutor for this agent, building it on first use."""
+        model, tools = self.model, self.tools
+        # Models are unhashable pydantic objects, so the key holds their id and the entry keeps the
+        # model itself alive: the id cannot be reused by another model while the entry exists
+        key = (self.system_message, id(model), tuple(getattr(tool, "name", repr(tool)) for tool in tools))
+        with self._executor_lock:
+            entry = self._executor_pool.get(key)
+            if entry is not None and entry[0] is model:
+                self._executor_pool.move_to_end(key)
+                return entry[1]
+            from langchain.agents import create_tool_calling_agent, AgentExecutor
+            agent = create_tool_calling_agent(model, tools, self.prompt)
+            executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
+            self._executor_pool[key] = (model, executor)
+            while len(self._executor_pool) > self._executor_pool_size:
+                self._executor_pool.popitem(last=False)
+        return executor
+
+    def agent_inputs(self, user_input):
+        # One-shot requests carry no chat_history; conversations go through chat() and the history store
+        return {
+            "input": user_input,
+            "agent_scratchpad": ""
+        }
+
+    def clean_output(self, response):
+        return str(response.get('output')).replace("```markdown", "").strip()
+
+    def trace_config(self, span, callbacks=()):
+        """Run config that records the model and tool calls of this request as children of span, plus any extra callbacks."""
+        from .tracing_callbacks import TracingCallbackHandler
+        return {"callbacks": [TracingCallbackHandler(span), *callbacks]}
+
+    def cached_response(self, user_input, span=None):
+        if self.response_cache is None:
+            return None
+        with tracer.span("cache.lookup", span) as lookup:
+            cached = self.response_cache.get(self.system_message, user_input, similar=self.similar_cache_hits)
+            lookup.attributes["cache.hit"] = cached is not None
+        tracer.increment("response_cache_hits_total" if cached is not None else "response_cache_misses_total")
+        if span is not None:
+            span.attributes["cache.hit"] = cached is not None
+        return cached
+
+    def cache_response(self, user_input, output):
+        if self.response_cache is not None:
+            self.response_cache.put(self.system_message, user_input, output, similar=self.similar_cache_hits)
+        return output
+
+    def run_agent(self, user_input, callbacks=()):
+        """Runs the tool calling agent and returns its cleaned markdown output.
+
+        Cached answers are returned without running the search tool or the model. callbacks are
+        LangChain callback handlers added to the run, e.g. to follow the tokens as they stream.
+        """
+        with tracer.span("agent.run", agent=type(self).__name__) as span:
+            cached = self.cached_response(user_input, span)
+            if cached is not None:
+                return cached
+            output = self.clean_output(self.agent_executor.invoke(self.agent_inputs(user_input),
+                                                                  config=self.trace_config(span, callbacks)))
+            return self.cache_response(user_input, output)
+
+    async def arun_agent(self, user_input):
+        """Async variant of run_agent that awaits the executor instead of blocking a worker."""
+        with tracer.span("agent.run", agent=type(self).__name__) as span:
+            cached = await asyncio.to_thread(self.cached_response, user_input, span)
+            if cached is not None:
+                return cached
+            output = self.clean_output(await self.agent_executor.ainvoke(self.agent_inputs(user_input), config=self.trace_config(span)))
+            return await asyncio.to_thread(self.cache_response, user_input, output)
+
+    async def astream_agent(self, user_input):
+        """Runs the tool calling agent and yields the answer as partial markdown while tokens arrive.
+
+        Text streamed by earlier model steps (tool call planning) is dropped when the next
+        model step starts, and the last value yielded is always the executor's final output.
+        """
+        with tracer.span("agent.stream", agent=type(self).__name__) as span:
+            cached = await asyncio.to_thread(self.cached_response, user_input, span)
+            if cached is not None:
+                yield cached
+                return
+            text = ""
+            events = self.agent_executor.astream_events(self.agent_inputs(user_input), config=self.trace_config(span), version="v2")
+            async for event in events:
+                kind = event["event"]
+                if kind == "on_chat_model_start":
+                    text = ""
+                elif kind == "on_chat_model_stream":
+                    chunk = event["data"]["chunk"].content
+                    if isinstance(chunk, str) and chunk:
+                        if "time_to_first_token" not in span.attributes:
+                            span.attributes["time_to_first_token"] = (time.time_ns() - span.start_ns) / 1e9
+                        text += chunk
+                        yield text.replace("```markdown", "")
+                elif kind == "on_chain_end" and not event["parent_ids"]:
+                    output = self.clean_output(event["data"]["output"])
+                    await asyncio.to_thread(self.cache_response, user_input, output)
+                    yield output
+
+    async def astream_output(self, user_input, kind, user=None):
+        """Streams the agent answer and archives the completed markdown in the background."""
+        output = ""
+        async for output in self.astream_agent(user_input):
+            yield output
+        await self.asave_output(output, kind, user_input, user)
+
+    def save_output(self, content, kind, prompt=None, user=None):
+        """Queues the content to be archived with the prompt and user it was made for, and returns it."""
+        return save_file(content, kind, user, prompt)
+
+    async def asave_output(self, content, kind, prompt=None, user=None):
+        # Queuing only blocks when the writer is backed up, so keep that off the event loop.
+        return await asyncio.to_thread(save_file, content, kind, user, prompt)
+
+    def start_turn(self, session_id, user_input):
+        history = self.history_store.get(session_id)
+        return self.trim_conversation(history + [{"role": "user", "content": user_input}])
+
+    def end_turn(self, session_id, messages, reply):
+        # The reply is trimmed together with the next user message on the following turn
+        self.history_store.set(session_id, messages + [{"role": "assistant", "content": reply}])
+        return reply
+
+    def chat(self, user_input, session_id="default"):
+        """Sends the user message with the session's trimmed chat history to the model and records the reply."""
+        with tracer.span("agent.chat", agent=type(self).__name__) as span:
+            messages = self.start_turn(session_id, user_input)
+            response = self.model.invoke(messages, config=self.trace_config(span))
+            return self.end_turn(session_id, messages, response.content)
+
+    async def achat(self, user_input, session_id="default"):
+        with tracer.span("agent.chat", agent=type(self).__name__) as span:
+            # Reading and writing the history store, and summarizing evicted turns, block,
+            # so they run in a worker thread instead of on the event loop
+            messages = await asyncio.to_thread(self.start_turn, session_id, user_input)
+            response = await self.model.ainvoke(messages, config=self.trace_config(span))
+            return await asyncio.to_thread(self.end_turn, session_id, messages, response.content)
+
+    def clear_history(self, session_id="default"):
+        self.history_store.clear(session_id)
 
     def trim_conversation(self, messages):
-        """Trims conversation history to retain only the latest messages."""
-        max_messages = 10
-        return messages[-max_messages:] if len(messages) > max_messages else messages 
\ No newline at end of file
+        """Trims conversation history to the latest messages that fit in the token budget."""
+        return self.trimmer.trim(messages)
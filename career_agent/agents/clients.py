@@ -0,0 +1,43 @@
+"""
+Shared model clients and tools, created on first use and reused by every agent
+"""
+import threading
+from utils.search_cache import CachedSearch, RateLimiter
+from .models import create_chat_model, create_search
+from config.settings import SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE, SEARCH_RATE_LIMIT, SEARCH_BURST
+
+_clients = {}
+_lock = threading.RLock()
+
+def _shared(name, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+def get_chat_model():
+    return _shared("chat_model", create_chat_model)
+
+def get_search():
+    """Returns the web search shared by all agents, behind a cache, request coalescing and a rate limit."""
+    def build():
+        return CachedSearch(create_search(), SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE, RateLimiter(SEARCH_RATE_LIMIT, SEARCH_BURST))
+    return _shared("search", build)
+
+def get_search_tools():
+    def build():
+        from langchain_core.tools import StructuredTool
+        search = get_search()
+        return [StructuredTool.from_function(
+            func=search.run,
+            coroutine=search.arun,
+            name="duckduckgo_results_json",
+            description=(
+                "A wrapper around Duck Duck Go Search. Useful for when you need to answer questions about "
+                "current events. Input should be a search query."
+            ),
+        )]
+    return _shared("search_tools", build)
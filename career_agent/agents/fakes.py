@@ -0,0 +1,140 @@
+"""
+Deterministic offline stand-ins for the chat model and web search, for tests and load benchmarks without an API key
+"""
+import asyncio
+import json
+import time
+import zlib
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from .prompts import message_bytes, prefix_length
+
+DEFAULT_REPLY = """# Fake response
+
+This answer was produced by the offline fake model.
+
+### Senior AI Engineer
+- **Company:** Example Labs
+- **Location:** Remote
+- **Required Skills:** Python, LangChain, RAG
+- **Experience Level:** Senior
+- **Job Description:** Builds retrieval augmented generation services.
+- **Application Link:** https://example.com/jobs/1"""
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that replays a script instead of calling an API.
+
+    The same messages always produce the same output. When tool_calls is set, tools are
+    bound and the conversation has no tool results yet, the model answers with those calls (an "{input}"
+    placeholder in their arguments becomes the latest user message); otherwise it answers
+    with reply. latency is the delay before the first token and tokens_per_second paces
+    the rest of the reply, one word per token (0 means instant).
+
+    bytes_sent counts the prompt bytes a provider would receive. With prefix_cache, a stable
+    system prefix (see agents.prompts) is sent once and referenced by id afterwards, the way
+    context caching APIs work; the bytes skipped are counted in bytes_cached.
+    """
+    reply: str = DEFAULT_REPLY
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    tool_calls: list = []
+    prefix_cache: bool = False
+    bytes_sent: int = 0
+    bytes_cached: int = 0
+    cached_prefixes: set = set()
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _transmit(self, messages):
+        prefix = prefix_length(messages)
+        for message in messages[:prefix]:
+            if self.prefix_cache and message.id in self.cached_prefixes:
+                self.bytes_cached += message_bytes(message)
+            else:
+                self.cached_prefixes.add(message.id)
+                self.bytes_sent += message_bytes(message)
+        self.bytes_sent += sum(message_bytes(m) for m in messages[prefix:])
+
+    def _next_message(self, messages, tools):
+        self._transmit(messages)
+        if self.tool_calls and tools and not any(isinstance(m, ToolMessage) for m in messages):
+            user_input = next((m.content for m in reversed(messages) if m.type == "human" and m.content), "")
+            calls = [{
+                "name": call["name"],
+                "args": {k: v.replace("{input}", user_input) if isinstance(v, str) else v for k, v in call["args"].items()},
+                "id": f"call_{i}",
+            } for i, call in enumerate(self.tool_calls)]
+            return AIMessage(content="", tool_calls=calls)
+        return AIMessage(content=self.reply)
+
+    def _tokens(self):
+        words = self.reply.split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def _delay(self, message):
+        if self.tokens_per_second and message.content:
+            return self.latency + len(self._tokens()) / self.tokens_per_second
+        return self.latency
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next_message(messages, kwargs.get("tools"))
+        time.sleep(self._delay(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next_message(messages, kwargs.get("tools"))
+        await asyncio.sleep(self._delay(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next_message(messages, kwargs.get("tools"))
+        time.sleep(self.latency)
+        if message.tool_calls:
+            yield self._tool_call_chunk(message)
+            return
+        for token in self._tokens():
+            if self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _tool_call_chunk(self, message):
+        return ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+            {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+            for i, c in enumerate(message.tool_calls)]))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next_message(messages, kwargs.get("tools"))
+        await asyncio.sleep(self.latency)
+        if message.tool_calls:
+            yield self._tool_call_chunk(message)
+            return
+        for token in self._tokens():
+            if self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+class FakeSearch:
+    """Search backend that answers after a fixed delay with results derived from the query, and counts calls."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, query):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"[snippet: results for {query}, title: Fake result, link: https://example.com/search/{zlib.crc32(query.encode('utf-8')) % 1000}]"
@@ -0,0 +1,161 @@
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from .base_agent import BaseAgent
+from .prompts import system_prefix, parse_list
+from utils.response_cache import normalize_prompt
+from utils.tracing import tracer
+from config.settings import (INTERVIEW_PLAN_MESSAGE, INTERVIEW_SCORING_MESSAGE, INTERVIEW_QUESTION_COUNT,
+                             INTERVIEW_SCORING_WORKERS, HISTORY_MAX_SESSIONS)
+
+NO_INTERVIEW = "_No active interview. Click \"Start Interview\" to begin a new one._"
+_SCORE = re.compile(r"score\W*(\d+(?:\.\d+)?)\s*(?:/\s*10)?", re.IGNORECASE)
+
+def parse_questions(text):
+    """Returns the numbered or bulleted items of the plan, or the whole text as one question."""
+    return parse_list(text) or [text.strip()]
+
+def parse_score(text):
+    """Returns the score out of 10 given in the evaluation, or None when there is none."""
+    match = _SCORE.search(text)
+    return min(float(match.group(1)), 10.0) if match else None
+
+@dataclass
+class InterviewTurn:
+    question: str
+    answer: str
+    evaluation: object  # Future resolving to {"score": float | None, "feedback": str}
+
+@dataclass
+class InterviewSession:
+    role: str
+    questions: list
+    turns: list = field(default_factory=list)
+
+    @property
+    def next_question(self):
+        return self.questions[len(self.turns)] if len(self.turns) < len(self.questions) else None
+
+class InterviewEngine(BaseAgent):
+    """Runs a mock interview from a fixed question plan, scoring each answer in the background.
+
+    The plan for a role is generated once and kept in a plan cache keyed on the normalized role
+    (exact matches only, so a similar role never gets another role's questions). Submitting an answer
+    only queues its evaluation (one model call over that question and answer) and returns the
+    next question from the plan, so a turn costs the same however long the interview gets.
+    The report is built from the stored evaluations instead of re-reading the transcript.
+    """
+    _scoring_pool = ThreadPoolExecutor(max_workers=INTERVIEW_SCORING_WORKERS, thread_name_prefix="interview-scoring")
+
+    def __init__(self, plan_message=INTERVIEW_PLAN_MESSAGE, scoring_message=INTERVIEW_SCORING_MESSAGE,
+                 question_count=INTERVIEW_QUESTION_COUNT, max_sessions=HISTORY_MAX_SESSIONS, max_plans=256):
+        super().__init__(plan_message)
+        self.scoring_message = scoring_message
+        self.question_count = question_count
+        self.max_sessions = max_sessions
+        self.max_plans = max_plans
+        self._sessions = OrderedDict()
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, role):
+        """Returns the interview questions for a role, generating them on the first request."""
+        key = (normalize_prompt(role), self.question_count)
+        with tracer.span("interview.plan", role=role) as span:
+            with self._lock:
+                questions = self._plans.get(key)
+                if questions is not None:
+                    self._plans.move_to_end(key)
+            span.attributes["cache.hit"] = questions is not None
+            if questions is None:
+                plan_input = f"Role: {role}\nNumber of questions: {self.question_count}"
+                response = self.model.invoke([system_prefix(self.system_message), ("human", plan_input)],
+                                             config=self.trace_config(span))
+                questions = parse_questions(str(response.content))[:self.question_count]
+                with self._lock:
+                    self._plans[key] = questions
+                    while len(self._plans) > self.max_plans:
+                        self._plans.popitem(last=False)
+        return list(questions)
+
+    def start(self, role, session_id="default"):
+        """Starts a new interview for the session and returns the first question."""
+        session = InterviewSession(role, self.plan(role))
+        with self._lock:
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session.next_question
+
+    def answer(self, answer, session_id="default"):
+        """Records the answer, queues its evaluation and returns the next question (None once the plan is done).
+
+        Returns NO_INTERVIEW when the session has no interview, e.g. after a reset or once it was evicted.
+        """
+        session = self._session(session_id)
+        if session is None:
+            return NO_INTERVIEW
+        question = session.next_question
+        if question is None:
+            return None
+        evaluation = self._scoring_pool.submit(self.score, session.role, question, answer)
+        session.turns.append(InterviewTurn(question, answer, evaluation))
+        return session.next_question
+
+    def score(self, role, question, answer):
+        """Evaluates a single answer; the prompt holds only this question and answer."""
+        with tracer.span("interview.score", role=role) as span:
+            response = self.model.invoke([
+                system_prefix(self.scoring_message),
+                ("human", f"Role: {role}\nQuestion: {question}\nCandidate answer: {answer}"),
+            ], config=self.trace_config(span))
+        feedback = str(response.content).strip()
+        return {"score": parse_score(feedback), "feedback": feedback}
+
+    def report(self, session_id="default"):
+        """Builds the evaluation report from the stored scores, waiting for any still being computed.
+
+        Returns NO_INTERVIEW when the session has no interview.
+        """
+        session = self._session(session_id)
+        if session is None:
+            return NO_INTERVIEW
+        lines = [f"# Mock Interview Report: {session.role}", ""]
+        scores = []
+        for number, turn in enumerate(session.turns, 1):
+            try:
+                evaluation = turn.evaluation.result()
+            except Exception as e:
+                evaluation = {"score": None, "feedback": f"_Scoring failed: {e}_"}
+            if evaluation["score"] is not None:
+                scores.append(evaluation["score"])
+            score = f"{evaluation['score']:g}/10" if evaluation["score"] is not None else "not scored"
+            lines += [f"## Question {number} ({score})", f"**Q:** {turn.question}", "",
+                      f"**Your answer:** {turn.answer}", "", evaluation["feedback"], ""]
+        if scores:
+            lines.insert(2, f"**Overall score:** {sum(scores) / len(scores):.1f}/10 over {len(scores)} scored answers\n")
+        unanswered = len(session.questions) - len(session.turns)
+        if unanswered:
+            lines.append(f"_{unanswered} planned questions were not answered._")
+        return self.save_output("\n".join(lines), 'Mock_interview_report', session.role, session_id)
+
+    def clear(self, session_id="default"):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    async def astart(self, role, session_id="default"):
+        return await asyncio.to_thread(self.start, role, session_id)
+
+    async def aanswer(self, answer, session_id="default"):
+        return await asyncio.to_thread(self.answer, answer, session_id)
+
+    async def areport(self, session_id="default"):
+        return await asyncio.to_thread(self.report, session_id)
+
+    def _session(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
@@ -1,19 +1,118 @@
+import asyncio
+import csv
+import io
+import time
 from .base_agent import BaseAgent
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from utils.file_handler import save_file
+from utils.file_handler import output_store, save_file
+from utils.response_cache import normalize_prompt
+from utils.job_index import get_job_index, parse_job_listings
+from config.settings import BATCH_CONCURRENCY, BATCH_TIMEOUT
+
+def parse_job_queries(csv_text):
+    """Reads job search queries from CSV text.
+
+    Accepts a header with `title` and optional `location` columns, a `query` column, or
+    headerless rows of title and location. Duplicate queries are dropped.
+    """
+    rows = [[cell.strip() for cell in row] for row in csv.reader(io.StringIO(csv_text)) if any(c.strip() for c in row)]
+    if not rows:
+        return []
+    header = [cell.lower() for cell in rows[0]]
+    if "title" in header:
+        title, location = header.index("title"), header.index("location") if "location" in header else None
+        pairs = [(row[title], row[location] if location is not None and location < len(row) else "") for row in rows[1:] if title < len(row)]
+    else:
+        pairs = [(row[0], row[1] if len(row) > 1 else "") for row in (rows[1:] if header[0] == "query" else rows)]
+    queries = {}
+    for title, location in pairs:
+        if title:
+            query = f"{title} in {location}" if location else title
+            queries.setdefault(normalize_prompt(query), query)
+    return list(queries.values())
 
 class JobSearch(BaseAgent):
+    # Searches for different roles or places read alike, so only an identical request reuses an answer
+    similar_cache_hits = False
+
     def __init__(self, system_message):
         super().__init__(system_message)
-        self.agent = create_tool_calling_agent(self.model, self.tools, self.prompt)
-        self.agent_executor = AgentExecutor(agent=self.agent, tools=self.tools, verbose=True)
+        self.job_index = get_job_index()
+
+    def refresh_input(self, user_input, known):
+        """Asks only for positions that are not already indexed for a repeated search."""
+        if not known:
+            return user_input
+        seen = "\n".join(f"- {listing.title} at {listing.company}" for listing in known)
+        return f"{user_input}\n\nThese positions are already known, list only positions not among them:\n{seen}"
+
+    def known_section(self, known):
+        if not known:
+            return ""
+        return "\n\n## Previously Found\n\n" + "\n\n".join(listing.to_markdown() for listing in known)
+
+    def index_output(self, user_input, output):
+        return self.job_index.add(parse_job_listings(output), query=user_input)
 
     def find_jobs(self, user_input):
-        response = self.agent_executor.invoke({
-            "input": user_input,
-            "chat_history": self.chat_history,
-            "agent_scratchpad": ""
-        })
-        path = save_file(str(response.get('output')).replace("```markdown", "").strip(), 'Job_search')
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read() 
\ No newline at end of file
+        known = self.job_index.for_query(user_input)
+        output = self.run_agent(self.refresh_input(user_input, known))
+        self.index_output(user_input, output)
+        return self.save_output(output + self.known_section(known), 'Job_search', user_input)
+
+    async def afind_jobs(self, user_input):
+        known = await asyncio.to_thread(self.job_index.for_query, user_input)
+        output = await self.arun_agent(self.refresh_input(user_input, known))
+        await asyncio.to_thread(self.index_output, user_input, output)
+        return await self.asave_output(output + self.known_section(known), 'Job_search', user_input)
+
+    async def astream_jobs(self, user_input):
+        # Listings found by earlier runs of this search are shown at once, new ones stream in above them
+        known = await asyncio.to_thread(self.job_index.for_query, user_input)
+        saved = self.known_section(known)
+        if saved:
+            yield saved
+        output = ""
+        async for output in self.astream_output(self.refresh_input(user_input, known), 'Job_search'):
+            yield output + saved
+        await asyncio.to_thread(self.index_output, user_input, output)
+
+    def filter_listings(self, skills="", location="", experience_level="", text=""):
+        """Filters every listing indexed so far, without calling the model or the search tool."""
+        return self.job_index.search(skills, location, experience_level, text)
+
+    async def afind_jobs_batch(self, queries, concurrency=BATCH_CONCURRENCY, timeout=BATCH_TIMEOUT):
+        """Runs many job searches and yields each result as soon as it finishes.
+
+        Duplicate queries are searched once, at most `concurrency` searches run together and
+        a search that takes longer than `timeout` seconds is reported as timed out.
+        """
+        unique = {}
+        for query in queries:
+            unique.setdefault(normalize_prompt(query), query)
+        limit = asyncio.Semaphore(concurrency)
+
+        async def search(query):
+            async with limit:
+                start = time.perf_counter()
+                try:
+                    output, status = await asyncio.wait_for(self.arun_agent(query), timeout), "done"
+                    await asyncio.to_thread(self.index_output, query, output)
+                except asyncio.TimeoutError:
+                    output, status = "", "timed out"
+                except Exception as e:
+                    output, status = "", f"failed: {e}"
+                return {"query": query, "status": status, "seconds": time.perf_counter() - start, "output": output}
+
+        for result in asyncio.as_completed([search(query) for query in unique.values()]):
+            yield await result
+
+    def save_batch_report(self, results):
+        """Saves one markdown report and one CSV for a batch, returning the markdown and the CSV path."""
+        sections = [f"## {r['query']}\n\n{r['output'] if r['status'] == 'done' else '_Search ' + r['status'] + '_'}" for r in results]
+        report = "# Batch Job Search\n\n" + "\n\n".join(sections)
+        rows = io.StringIO()
+        writer = csv.writer(rows)
+        writer.writerow(["query", "status", "seconds", "listings"])
+        for r in results:
+            writer.writerow([r["query"], r["status"], f"{r['seconds']:.1f}", r["output"]])
+        return save_file(report, 'Job_search_batch'), output_store.write(rows.getvalue(), 'Job_search_batch', 'csv')
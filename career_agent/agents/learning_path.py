@@ -0,0 +1,76 @@
+import asyncio
+from .base_agent import BaseAgent
+from .prompts import system_prefix, parse_list, normalize_system_message
+from utils.learning_graph import get_topic_graph, section_key
+from utils.tracing import tracer
+from config.settings import (LEARNING_SECTION_MESSAGE, LEARNING_PATH_PLAN_MESSAGE, LEARNING_PATH_DEPTH,
+                             LEARNING_PATH_MAX_PREREQUISITES)
+
+class LearningPathAgent(BaseAgent):
+    """Builds a learning path for a topic from sections shared through the topic graph.
+
+    Prerequisites are planned once per topic and sections are written once per topic, so a
+    path only costs model calls for the parts of the graph no earlier path has covered.
+    """
+
+    def __init__(self, system_message=LEARNING_SECTION_MESSAGE, plan_message=LEARNING_PATH_PLAN_MESSAGE,
+                 depth=LEARNING_PATH_DEPTH, max_prerequisites=LEARNING_PATH_MAX_PREREQUISITES, graph=None):
+        super().__init__(system_message)
+        self.plan_message = plan_message
+        self.depth = depth
+        self.max_prerequisites = max_prerequisites
+        self.graph = graph or get_topic_graph()
+
+    def plan_prerequisites(self, topic):
+        """Asks the model for the topic's direct prerequisites."""
+        with tracer.span("learning.plan", topic=topic) as span:
+            response = self.model.invoke([system_prefix(self.plan_message), ("human", f"Topic: {topic}")],
+                                         config=self.trace_config(span))
+        return parse_list(str(response.content))[:self.max_prerequisites]
+
+    def expand(self, topic, depth, stats):
+        """Stores the prerequisites of topic and of theirs down to depth, planning only unexpanded topics."""
+        prerequisites = self.graph.prerequisites(topic)
+        if prerequisites is None:
+            prerequisites = self.plan_prerequisites(topic)
+            self.graph.set_prerequisites(topic, prerequisites)
+            stats["plans"] += 1
+        if depth > 1:
+            for prerequisite in prerequisites:
+                self.expand(prerequisite, depth - 1, stats)
+
+    def section(self, topic, stats):
+        key = section_key(topic, normalize_system_message(self.system_message))
+        content = self.graph.section(key)
+        if content is None:
+            content = self.run_agent(f"Write the tutorial section on: {topic}")
+            self.graph.put_section(key, topic, content)
+            stats["generated"] += 1
+            tracer.increment("learning_section_misses_total")
+        else:
+            stats["reused"] += 1
+            tracer.increment("learning_section_hits_total")
+        return content
+
+    def build_path(self, topic):
+        """Returns the path's topics in learning order, their sections, and counts of planning calls and generated/reused sections."""
+        stats = {"plans": 0, "generated": 0, "reused": 0}
+        with tracer.span("learning.path", topic=topic) as span:
+            self.expand(topic, self.depth, stats)
+            order = self.graph.path(topic)
+            sections = [self.section(name, stats) for name in order]
+            span.attributes.update(stats)
+        return order, sections, stats
+
+    def learning_path(self, topic):
+        """Returns the learning path for topic as markdown, generating only the missing sections."""
+        order, sections, stats = self.build_path(topic)
+        contents = "\n".join(f"{i}. {name}" for i, name in enumerate(order, 1))
+        reuse = stats["reused"] / len(order)
+        summary = (f"_{len(order)} sections: {stats['reused']} reused, {stats['generated']} generated "
+                   f"({reuse:.0%} from the topic graph); {stats['plans']} topics planned._")
+        output = "\n\n".join([f"# Learning Path: {topic}", summary, "## Contents", contents] + sections)
+        return self.save_output(output, 'Learning_path', topic)
+
+    async def alearning_path(self, topic):
+        return await asyncio.to_thread(self.learning_path, topic)
@@ -0,0 +1,53 @@
+"""
+Registry of chat model and search backends, selected by MODEL_BACKEND and SEARCH_BACKEND in config/settings.py
+"""
+from config.settings import (MODEL_BACKEND, MODEL_NAME, SEARCH_BACKEND, FAKE_MODEL_LATENCY,
+                             FAKE_MODEL_TOKENS_PER_SECOND, FAKE_MODEL_TOOL_CALLS, FAKE_SEARCH_LATENCY)
+
+MODEL_BACKENDS = {}
+SEARCH_BACKENDS = {}
+
+def register_model(name):
+    """Registers a factory returning a LangChain chat model under the given backend name."""
+    def decorator(factory):
+        MODEL_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+def register_search(name):
+    """Registers a factory returning a search callable (query -> results text) under the given backend name."""
+    def decorator(factory):
+        SEARCH_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+@register_model("gemini")
+def gemini_model():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=MODEL_NAME)
+
+@register_model("fake")
+def fake_model():
+    from .fakes import FakeChatModel
+    tool_calls = [{"name": "duckduckgo_results_json", "args": {"query": "{input}"}}] if FAKE_MODEL_TOOL_CALLS else []
+    return FakeChatModel(latency=FAKE_MODEL_LATENCY, tokens_per_second=FAKE_MODEL_TOKENS_PER_SECOND, tool_calls=tool_calls)
+
+@register_search("duckduckgo")
+def duckduckgo_search():
+    from langchain_community.tools import DuckDuckGoSearchResults
+    return DuckDuckGoSearchResults().invoke
+
+@register_search("fake")
+def fake_search():
+    from .fakes import FakeSearch
+    return FakeSearch(FAKE_SEARCH_LATENCY)
+
+def create_chat_model(backend=MODEL_BACKEND):
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown MODEL_BACKEND '{backend}', expected one of {', '.join(MODEL_BACKENDS)}")
+    return MODEL_BACKENDS[backend]()
+
+def create_search(backend=SEARCH_BACKEND):
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown SEARCH_BACKEND '{backend}', expected one of {', '.join(SEARCH_BACKENDS)}")
+    return SEARCH_BACKENDS[backend]()
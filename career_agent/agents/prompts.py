@@ -0,0 +1,57 @@
+"""
+Prompt templates compiled once per system message and shared by every agent using it, and parsing of list answers
+"""
+import hashlib
+import re
+from functools import lru_cache
+
+PREFIX_ID = "prefix-"
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*])\s+(.+?)\s*$")
+
+def normalize_system_message(text):
+    """Drops the source indentation of the triple quoted messages in settings, which would be resent on every call."""
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+@lru_cache(maxsize=None)
+def system_prefix(system_message):
+    """Returns the stable system message that starts every prompt built from system_message.
+
+    It is a literal message rather than a template, so it is never re-rendered, and its id
+    carries a content hash that a backend with prefix (context) caching can key on.
+    """
+    from langchain_core.messages import SystemMessage
+    content = normalize_system_message(system_message)
+    return SystemMessage(content=content, id=PREFIX_ID + hashlib.sha256(content.encode("utf-8")).hexdigest()[:16])
+
+@lru_cache(maxsize=None)
+def compile_agent_prompt(system_message):
+    """Returns the shared tool calling agent prompt: the system prefix followed by the per-request parts."""
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages([
+        system_prefix(system_message),
+        ("human", "{input}"),
+        MessagesPlaceholder(variable_name="chat_history", optional=True),
+        MessagesPlaceholder(variable_name="agent_scratchpad")
+    ])
+
+def prefix_length(messages):
+    """Number of leading messages that belong to a stable prefix."""
+    count = 0
+    for message in messages:
+        if not (getattr(message, "id", None) or "").startswith(PREFIX_ID):
+            break
+        count += 1
+    return count
+
+def message_bytes(message):
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return len(content.encode("utf-8"))
+
+def prompt_bytes(messages):
+    """Returns (total bytes, stable prefix bytes) of the message contents of a prompt."""
+    prefix = sum(message_bytes(m) for m in messages[:prefix_length(messages)])
+    return prefix + sum(message_bytes(m) for m in messages[prefix_length(messages):]), prefix
+
+def parse_list(text):
+    """Returns the numbered or bulleted items of a model answer, without bold markers."""
+    return [m.group(1).replace("**", "").strip() for m in map(_LIST_ITEM.match, text.splitlines()) if m]
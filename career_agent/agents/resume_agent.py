@@ -1,19 +1,15 @@
 from .base_agent import BaseAgent
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from utils.file_handler import save_file
 
 class ResumeMaker(BaseAgent):
-    def __init__(self, system_message):
-        super().__init__(system_message)
-        self.agent = create_tool_calling_agent(self.model, self.tools, self.prompt)
-        self.agent_executor = AgentExecutor(agent=self.agent, tools=self.tools, verbose=True)
+    # Two resumes for different people read alike, so only an identical request reuses an answer
+    similar_cache_hits = False
 
-    def create_resume(self, user_input):
-        response = self.agent_executor.invoke({
-            "input": user_input,
-            "chat_history": self.chat_history,
-            "agent_scratchpad": ""
-        })
-        path = save_file(str(response.get('output')).replace("```markdown", "").strip(), 'Resume')
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read() 
\ No newline at end of file
+    def create_resume(self, user_input, user=None):
+        return self.save_output(self.run_agent(user_input), 'Resume', user_input, user)
+
+    async def acreate_resume(self, user_input, user=None):
+        return await self.asave_output(await self.arun_agent(user_input), 'Resume', user_input, user)
+
+    async def astream_resume(self, user_input, user=None):
+        async for partial in self.astream_output(user_input, 'Resume', user):
+            yield partial
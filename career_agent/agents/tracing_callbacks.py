@@ -0,0 +1,67 @@
+from langchain_core.callbacks import BaseCallbackHandler
+from utils.tracing import tracer
+from utils.token_budget import estimate_tokens
+from .prompts import prompt_bytes
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Records a span for every model and tool call of one agent request, under the request's span.
+
+    Token counts come from the model's usage metadata, or are estimated from the text when
+    the backend does not report them. Prompt bytes are split into the stable system prefix
+    and the per-request rest.
+    """
+    run_inline = True
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._spans = {}
+
+    def _start(self, run_id, parent_run_id, name, **attributes):
+        parent = self._spans.get(parent_run_id, self.parent)
+        self._spans[run_id] = tracer.start_span(name, parent, **attributes)
+
+    def _end(self, run_id, error=None, **attributes):
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.attributes.update(attributes)
+            tracer.end_span(span, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        input_tokens = sum(estimate_tokens(str(m.content)) for batch in messages for m in batch)
+        sizes = [prompt_bytes(batch) for batch in messages]
+        total, prefix = sum(size[0] for size in sizes), sum(size[1] for size in sizes)
+        tracer.increment("prompt_bytes_total", total)
+        tracer.increment("prompt_prefix_bytes_total", prefix)
+        self._start(run_id, parent_run_id, "model", **{"gen_ai.usage.input_tokens": input_tokens,
+                                                         "prompt.bytes": total, "prompt.prefix_bytes": prefix})
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._spans.get(run_id)
+        if span is None:
+            return
+        message = getattr(response.generations[0][0], "message", None) if response.generations and response.generations[0] else None
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            input_tokens, output_tokens, estimated = usage["input_tokens"], usage["output_tokens"], False
+        else:
+            input_tokens = span.attributes["gen_ai.usage.input_tokens"]
+            output_tokens = estimate_tokens(str(message.content)) if message is not None else 0
+            estimated = True
+        tracer.increment("model_calls_total")
+        tracer.increment("model_input_tokens_total", input_tokens)
+        tracer.increment("model_output_tokens_total", output_tokens)
+        self._end(run_id, **{"gen_ai.usage.input_tokens": input_tokens, "gen_ai.usage.output_tokens": output_tokens,
+                             "tokens.estimated": estimated})
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        tracer.increment("tool_calls_total")
+        self._start(run_id, parent_run_id, f"tool.{(serialized or {}).get('name', 'unknown')}")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
@@ -5,6 +5,13 @@ from ui.learning_interface import create_learning_interface
 from ui.interview_interface import create_interview_interface
 from ui.resume_interface import create_resume_interface
 from ui.job_search_interface import create_job_search_interface
+from ui.match_interface import create_match_interface
+from ui.jobs_interface import create_jobs_interface
+from ui.archive_interface import create_archive_interface
+from ui.admin_interface import create_admin_interface
+from utils.tracing import start_metrics_server
+from utils.job_queue import get_job_queue
+from config.settings import CONCURRENCY_LIMIT, METRICS_PORT, METRICS_HOST
 
 load_dotenv()
 
@@ -19,9 +26,20 @@ def main_ui():
         create_interview_interface()
         create_resume_interface()
         create_job_search_interface()
+        create_match_interface()
+        create_jobs_interface()
+        create_archive_interface()
+        create_admin_interface()
     
+    # Handlers are async, so slow model calls wait on the event loop instead of
+    # holding a worker thread; the limit caps concurrent calls per event.
+    demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT)
     return demo
 
 if __name__ == "__main__":
     app = main_ui()
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT, METRICS_HOST)
+    # Starting the queue now resumes jobs interrupted by the last shutdown, once their lease has run out
+    get_job_queue()
     app.launch()
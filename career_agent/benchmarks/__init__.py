@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Career Assistant Agent, run from the career_agent folder with `python -m benchmarks.<name>`
+"""
@@ -0,0 +1,40 @@
+"""
+Batch job search throughput against the fake model at several concurrency settings.
+
+    python -m benchmarks.bench_batch_search --queries 50 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import time
+from agents.job_search_agent import JobSearch, parse_job_queries
+from config.settings import JOB_SEARCH_MESSAGE
+from benchmarks.stubs import stub_agent
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+async def run(agent, queries, concurrency):
+    start = time.perf_counter()
+    results = [result async for result in agent.afind_jobs_batch(queries, concurrency)]
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="injected model latency in seconds")
+    args = parser.parse_args()
+
+    # The last fifth of the rows repeat earlier ones in lower case, to exercise deduplication
+    distinct = max(1, args.queries * 4 // 5)
+    csv_text = "title,location\n" + "\n".join(
+        f"{'ML' if i < distinct else 'ml'} Engineer {i % distinct},City {i % distinct}" for i in range(args.queries))
+    queries = parse_job_queries(csv_text)
+    agent = stub_agent(JobSearch, JOB_SEARCH_MESSAGE, latency=args.latency)
+    agent.agent_executor.verbose = False
+    print(f"{args.queries} rows, {len(queries)} unique queries, model latency {args.latency}s")
+    for concurrency in (1, 4, 16):
+        results, elapsed = asyncio.run(run(agent, queries, concurrency))
+        print(f"concurrency {concurrency:2}: {len(results) / elapsed:6.1f} queries/s ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
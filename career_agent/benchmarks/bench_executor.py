@@ -0,0 +1,40 @@
+"""
+Compares per-request agent setup cost: building a new AgentExecutor on every call
+(the old tutorial/interview behaviour) against the pooled executor on BaseAgent.
+
+    python -m benchmarks.bench_executor
+"""
+import os
+import time
+from langchain.agents import create_tool_calling_agent, AgentExecutor
+from agents.learning_agent import LearningResourceAgent
+from config.settings import TUTORIAL_SYSTEM_MESSAGE
+from benchmarks.stubs import stub_agent
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+REQUESTS = 200
+
+def per_request_executor(agent, user_input):
+    executor = AgentExecutor(agent=create_tool_calling_agent(agent.model, agent.tools, agent.prompt), tools=agent.tools)
+    return executor.invoke({"input": user_input, "chat_history": [], "agent_scratchpad": ""})
+
+def pooled_executor(agent, user_input):
+    return agent.agent_executor.invoke({"input": user_input, "chat_history": [], "agent_scratchpad": ""})
+
+def timed(fn, agent):
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        fn(agent, f"Explain retrieval augmented generation, part {i}")
+    return (time.perf_counter() - start) / REQUESTS * 1000
+
+def main():
+    agent = stub_agent(LearningResourceAgent, TUTORIAL_SYSTEM_MESSAGE)
+    agent.agent_executor.verbose = False
+    before = timed(per_request_executor, agent)
+    after = timed(pooled_executor, agent)
+    print(f"per-request executor: {before:.2f} ms/request")
+    print(f"pooled executor:      {after:.2f} ms/request")
+    print(f"setup saved:          {before - after:.2f} ms/request")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Throughput of 100 concurrent saves: the old synchronous write-then-reread save_file
+with second-resolution names, against the background OutputStore archiving into a
+temporary OutputArchive. Also measures archive put and read throughput directly.
+
+    python -m benchmarks.bench_file_handler
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from utils.archive import OutputArchive
+from utils.file_handler import OutputStore
+
+SAVES = 100
+CONTENT = "# Tutorial\n\n" + "Some generated markdown. " * 400
+
+def legacy_save(folder_name, data, filename):
+    os.makedirs(folder_name, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    file_path = os.path.join(folder_name, f"{filename}_{timestamp}.md")
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(data)
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def run(save):
+    # Each save gets distinct content, as real outputs do, so the archive cannot dedupe them
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SAVES) as pool:
+        list(pool.map(lambda i: save(f"{CONTENT}\n{i}", "Tutorial"), range(SAVES)))
+    return time.perf_counter() - start
+
+def timed(label, function, count):
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:18}{count / elapsed:6.0f} ops/s")
+
+def main():
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as archive_dir:
+        legacy = run(lambda data, name: legacy_save(legacy_dir, data, name))
+        archive = OutputArchive(os.path.join(archive_dir, "store"))
+        store = OutputStore(os.path.join(archive_dir, "downloads"), archive=archive)
+        queued = run(store.save)
+        start = time.perf_counter()
+        store.flush()
+        flushed = queued + time.perf_counter() - start
+        stats = archive.stats()
+        print(f"legacy save_file: {SAVES / legacy:6.0f} saves/s, {len(os.listdir(legacy_dir))} of {SAVES} files kept")
+        print(f"OutputStore:      {SAVES / queued:6.0f} saves/s returned to callers, "
+              f"{SAVES / flushed:.0f} saves/s archived, {stats['entries']} of {SAVES} entries kept")
+        print(f"archive size:     {stats['bytes'] / 1024:.0f} KiB of markdown in {stats['stored_bytes'] / 1024:.0f} KiB ({stats['codec']})\n")
+
+        direct = OutputArchive(os.path.join(archive_dir, "direct"), retention_interval=0)
+        ids = []
+        timed("archive put (new)", lambda i: ids.append(direct.put(f"{CONTENT}\n{i}", "Tutorial", prompt=f"topic {i}")), SAVES)
+        timed("archive put (dup)", lambda i: direct.put(CONTENT + "\n0", "Tutorial"), SAVES)
+        timed("archive get", lambda i: direct.get(ids[i]), SAVES)
+        timed("archive search", lambda i: direct.search(text=f"topic {i}"), SAVES)
+
+if __name__ == "__main__":
+    main()
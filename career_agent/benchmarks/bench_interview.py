@@ -0,0 +1,63 @@
+"""
+Per-turn latency and prompt size of a long mock interview: the free-form chat, which resends the growing
+history to the model every turn, against the structured engine, which answers from its
+question plan and scores each answer in the background.
+
+    python -m benchmarks.bench_interview --turns 30 --latency 0.2
+"""
+import argparse
+import time
+from agents.fakes import FakeChatModel
+from agents.base_agent import BaseAgent
+from agents.interview_engine import InterviewEngine
+from benchmarks.stubs import stub_agent
+from utils.token_budget import estimate_tokens, message_tokens
+
+# The conversational interviewer the Mock Interview tab ran before the structured engine
+FREE_FORM_MESSAGE = '''You are a Generative AI Interviewer. You have conducted numerous interviews for Generative AI roles.
+         Your task is to conduct a mock interview for a Generative AI position, engaging in a back-and-forth interview session.
+         At the end of the interview, provide an evaluation for the candidate.'''
+ANSWER = "I would chunk the documents, embed them, retrieve the top passages and ground the answer on them. " * 4
+
+def report(name, latencies, prompt_tokens):
+    quarter = max(1, len(latencies) // 4)
+    first = sum(latencies[:quarter]) / quarter * 1000
+    last = sum(latencies[-quarter:]) / quarter * 1000
+    print(f"{name:18} first turns {first:8.1f} ms, last turns {last:8.1f} ms, "
+          f"prompt {prompt_tokens[0]:6} -> {prompt_tokens[-1]:6} tokens")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model delay per call, in seconds")
+    args = parser.parse_args()
+
+    chat_agent = stub_agent(BaseAgent, FREE_FORM_MESSAGE, latency=args.latency, reply="Next question: " + ANSWER)
+    latencies, prompt_tokens = [], []
+    for _ in range(args.turns):
+        start = time.perf_counter()
+        chat_agent.chat(ANSWER, "bench")
+        latencies.append(time.perf_counter() - start)
+        prompt_tokens.append(sum(message_tokens(m) for m in chat_agent.history_store.get("bench")[:-1]))
+    report("free-form chat", latencies, prompt_tokens)
+
+    questions = [f"Question {i} about retrieval?" for i in range(1, args.turns + 1)]
+    plan = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+    engine = InterviewEngine(question_count=args.turns)
+    engine.model = FakeChatModel(latency=args.latency, reply=plan)
+    engine.start("Generative AI Engineer", "bench")
+    engine.model = FakeChatModel(latency=args.latency, reply="Score: 7/10\nClear structure, mention evaluation.")
+    latencies, prompt_tokens = [], []
+    for turn in range(args.turns):
+        start = time.perf_counter()
+        engine.answer(ANSWER, "bench")
+        latencies.append(time.perf_counter() - start)
+        # The scoring prompt holds the system message, one question and one answer
+        prompt_tokens.append(estimate_tokens(engine.scoring_message) + estimate_tokens(questions[turn] + ANSWER))
+    report("structured engine", latencies, prompt_tokens)
+    start = time.perf_counter()
+    engine.report("bench")
+    print(f"{'report':18} {(time.perf_counter() - start) * 1000:8.1f} ms (waits for scoring still in flight)")
+
+if __name__ == "__main__":
+    main()
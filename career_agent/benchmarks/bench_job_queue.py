@@ -0,0 +1,105 @@
+"""
+Sustained background job throughput against the fake model, with thread and process
+workers, and crash recovery: the process running a queue is killed mid-batch and a new queue on the
+same database finishes its jobs.
+
+    python -m benchmarks.bench_job_queue --jobs 60 --workers 1 4 8
+    python -m benchmarks.bench_job_queue --crash
+"""
+import os
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_BACKEND", "fake")
+os.environ.setdefault("FAKE_SEARCH_LATENCY", "0.1")
+os.environ.setdefault("ARCHIVE_DIR", os.path.join(__import__("tempfile").gettempdir(), "bench_job_queue_archive"))
+
+import argparse
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from agents.background import generate
+from agents.learning_agent import LearningResourceAgent
+from benchmarks.stubs import stub_agent
+from utils.job_queue import JobQueue, HANDLER_MODULES, register_job
+from config.settings import TUTORIAL_SYSTEM_MESSAGE
+
+LATENCY = float(os.environ.get("BENCH_JOB_LATENCY", "0.3"))
+# Lease of the crash scenario: jobs of the killed process are only recovered once it has run out
+CRASH_LEASE = 2
+
+@lru_cache(maxsize=None)
+def _agent():
+    agent = stub_agent(LearningResourceAgent, TUTORIAL_SYSTEM_MESSAGE, latency=LATENCY, tokens_per_second=200,
+                       tool_calls=[{"name": "duckduckgo_results_json", "args": {"query": "{input}"}}])
+    agent.agent_executor.verbose = False
+    return agent
+
+@register_job("bench_tutorial")
+def bench_tutorial(payload, report):
+    return generate(_agent(), payload["input"], 'Bench_tutorial', report)
+
+HANDLER_MODULES.append(__name__)
+
+def throughput(db_path, mode, workers, jobs):
+    queue = JobQueue(db_path, workers, mode).start()
+    start = time.perf_counter()
+    ids = [queue.enqueue("bench_tutorial", {"input": f"topic {i}"}) for i in range(jobs)]
+    statuses = [queue.wait(job_id)["status"] for job_id in ids]
+    elapsed = time.perf_counter() - start
+    queue.stop()
+    return statuses.count("done"), elapsed
+
+def crash(db_path, jobs, workers):
+    """Runs a queue in a child process, kills it mid-batch, and lets a fresh queue recover the jobs."""
+    child = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_job_queue", "--serve", db_path,
+                              "--jobs", str(jobs), "--workers", str(workers)])
+    queue = JobQueue(db_path, workers, lease=CRASH_LEASE)
+    while queue.stats().get("done", 0) < jobs // 4:
+        time.sleep(0.1)
+    child.send_signal(signal.SIGKILL)
+    child.wait()
+    print(f"killed the worker process with {queue.stats()}")
+    start = time.perf_counter()
+    print(f"recover() right away: {queue.recover()} jobs (their lease is still live)")
+    time.sleep(CRASH_LEASE)
+    recovered = queue.recover()
+    queue.start()
+    while queue.stats().get("queued") or queue.stats().get("running"):
+        time.sleep(0.1)
+    queue.stop()
+    jobs = queue.recent(jobs)
+    retried = sum(job["attempts"] > 1 for job in jobs)
+    print(f"recovered {recovered} interrupted jobs, {retried} retried; finished in {time.perf_counter() - start:.1f}s "
+          f"with {queue.stats()}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=["thread", "process"])
+    parser.add_argument("--crash", action="store_true", help="run the crash recovery scenario instead")
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        queue = JobQueue(args.serve, args.workers[0], lease=CRASH_LEASE).start()
+        for i in range(args.jobs):
+            queue.enqueue("bench_tutorial", {"input": f"crash topic {i}"})
+        time.sleep(3600)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        if args.crash:
+            crash(os.path.join(folder, "crash.db"), args.jobs, args.workers[0])
+            return
+        print(f"{args.jobs} jobs, fake model latency {LATENCY}s per call")
+        for mode in args.modes:
+            for workers in args.workers:
+                done, elapsed = throughput(os.path.join(folder, f"{mode}_{workers}.db"), mode, workers, args.jobs)
+                print(f"{mode:7} x{workers:2}: {done / elapsed * 60:7.1f} jobs/min ({done}/{args.jobs} done in {elapsed:.1f}s)")
+
+if __name__ == "__main__":
+    main()
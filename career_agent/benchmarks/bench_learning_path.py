@@ -0,0 +1,58 @@
+"""
+Model calls per learning path as the topic graph fills in: a sequence of overlapping
+Generative AI topics is built against the fake model, with prerequisites taken from a
+fixed map instead of planning calls so every run sees the same graph.
+
+    python -m benchmarks.bench_learning_path --latency 0.05
+"""
+import argparse
+import os
+import tempfile
+from agents.learning_path import LearningPathAgent
+from agents.fakes import FakeChatModel
+from utils.learning_graph import TopicGraph
+from utils.tracing import tracer
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+PREREQUISITES = {
+    "Retrieval Augmented Generation": ["Embeddings", "Vector Databases", "Prompt Engineering"],
+    "Vector Databases": ["Embeddings", "Approximate Nearest Neighbour Search"],
+    "Embeddings": ["Tokenization", "Linear Algebra Basics"],
+    "Prompt Engineering": ["Large Language Models"],
+    "Large Language Models": ["Transformers", "Tokenization"],
+    "Transformers": ["Attention", "Linear Algebra Basics"],
+    "AI Agents": ["Prompt Engineering", "Tool Calling", "Retrieval Augmented Generation"],
+    "Tool Calling": ["Large Language Models", "JSON Schema"],
+    "Fine Tuning": ["Large Language Models", "Transformers", "Evaluation"],
+    "Evaluation": ["Large Language Models"],
+    "GraphRAG": ["Retrieval Augmented Generation", "Knowledge Graphs"],
+    "Knowledge Graphs": ["Embeddings"],
+}
+TOPICS = ["Retrieval Augmented Generation", "Vector Databases", "AI Agents", "Fine Tuning", "GraphRAG",
+          "Embeddings", "Prompt Engineering"]
+
+class MappedPathAgent(LearningPathAgent):
+    def plan_prerequisites(self, topic):
+        return PREREQUISITES.get(topic, [])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model latency per call in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        agent = MappedPathAgent(depth=4, graph=TopicGraph(os.path.join(folder, "graph.db")))
+        agent.model = FakeChatModel(latency=args.latency)
+        agent.response_cache = None
+        agent.agent_executor.verbose = False
+        print(f"{'topic':32} {'sections':>8} {'generated':>9} {'reused':>6}  hit rate so far")
+        for topic in TOPICS:
+            order, _, stats = agent.build_path(topic)
+            hits = tracer.counters["learning_section_hits_total"]
+            total = hits + tracer.counters["learning_section_misses_total"]
+            print(f"{topic:32} {len(order):8} {stats['generated']:9} {stats['reused']:6}  {hits / total:6.0%}")
+        print(agent.graph.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Resume matching speed: ranks a synthetic corpus of job listings against a resume with the
+exact NumPy scan and with the IVF approximate index, and reports recall of the approximate top 10.
+
+    python -m benchmarks.bench_matching --listings 100000
+"""
+import argparse
+import random
+import time
+from utils.job_index import JobListing
+from utils.matching import JobMatcher, listing_text, embed_texts
+
+SKILLS = "python pytorch tensorflow langchain rag llm sql spark kubernetes docker aws gcp nlp vision mlops".split()
+TITLES = ["AI Engineer", "ML Engineer", "Data Scientist", "GenAI Developer", "MLOps Engineer", "Research Scientist"]
+LEVELS = ["Junior", "Mid-level", "Senior", "Lead"]
+RESUME = ("Senior AI Engineer with 6 years of Python, PyTorch and LangChain experience, building RAG "
+          "pipelines and LLM applications on AWS with Docker and Kubernetes.")
+
+def synthetic_listings(count, seed=3):
+    rng = random.Random(seed)
+    return [JobListing(title=rng.choice(TITLES), company=f"Company {i}", location=f"City {rng.randrange(200)}",
+                       skills=rng.sample(SKILLS, 4), experience_level=rng.choice(LEVELS),
+                       description=" ".join(rng.sample(SKILLS, 6)))
+            for i in range(count)]
+
+def timed_rank(matcher, repeats=5):
+    matcher.rank(RESUME)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        matches = matcher.rank(RESUME, 10)
+    return (time.perf_counter() - start) / repeats * 1000, matches
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--listings", type=int, default=100000)
+    args = parser.parse_args()
+
+    listings = synthetic_listings(args.listings)
+    start = time.perf_counter()
+    exact = JobMatcher(ann_threshold=0)
+    vectors = embed_texts(exact.embedder, [listing_text(listing) for listing in listings])
+    exact.add(listings, vectors)
+    print(f"embedded {args.listings} listings in {time.perf_counter() - start:.1f}s (one-off, at index time)")
+
+    exact_ms, exact_matches = timed_rank(exact)
+    print(f"exact scan: {exact_ms:7.1f} ms per resume")
+
+    approximate = JobMatcher(ann_threshold=1)
+    approximate.add(listings, vectors)
+    start = time.perf_counter()
+    approximate.rank(RESUME)
+    print(f"IVF build:  {(time.perf_counter() - start) * 1000:7.1f} ms (once per corpus change)")
+    ann_ms, ann_matches = timed_rank(approximate)
+    # Synthetic listings tie often, so a match counts when it scores at least the exact 10th best
+    recall = sum(score >= exact_matches[-1][0] - 1e-6 for score, _ in ann_matches) / len(exact_matches)
+    print(f"IVF search: {ann_ms:7.1f} ms per resume, recall@10 {recall:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Prompt bytes sent per request and template cost per agent, comparing the old per-instance
+template over the raw settings messages with the shared compiled templates, without and
+with a backend that caches the stable system prefix (the fake model's prefix_cache).
+
+    python -m benchmarks.bench_prompts --requests 200
+"""
+import argparse
+import time
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from agents.fakes import FakeChatModel
+from agents.prompts import compile_agent_prompt
+from config.settings import (TUTORIAL_SYSTEM_MESSAGE, RESUME_SYSTEM_MESSAGE, JOB_SEARCH_MESSAGE,
+                             INTERVIEW_QUESTIONS_MESSAGE)
+
+MESSAGES = {
+    "tutorial": TUTORIAL_SYSTEM_MESSAGE,
+    "resume": RESUME_SYSTEM_MESSAGE,
+    "job search": JOB_SEARCH_MESSAGE,
+    "interview questions": INTERVIEW_QUESTIONS_MESSAGE,
+}
+
+def legacy_prompt(system_message):
+    return ChatPromptTemplate.from_messages([
+        ("system", system_message),
+        ("human", "{input}"),
+        MessagesPlaceholder(variable_name="chat_history", optional=True),
+        MessagesPlaceholder(variable_name="agent_scratchpad")
+    ])
+
+def send(build_prompt, system_message, requests, **model_kwargs):
+    """Builds the prompt once per request, as each click built a new agent, and returns (us per build, bytes per request)."""
+    model = FakeChatModel(reply="ok", **model_kwargs)
+    build = 0.0
+    for i in range(requests):
+        start = time.perf_counter()
+        prompt = build_prompt(system_message)
+        build += time.perf_counter() - start
+        model.invoke(prompt.format_messages(input=f"request {i} about retrieval augmented generation", agent_scratchpad=[]))
+    return build / requests * 1e6, model.bytes_sent / requests
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    print("prompt bytes sent per request and template build time per agent")
+    print(f"{'agent':20} {'legacy':>18} {'compiled':>18} {'+ prefix cache':>18}")
+    for name, system_message in MESSAGES.items():
+        legacy = send(legacy_prompt, system_message, args.requests)
+        compiled = send(compile_agent_prompt, system_message, args.requests)
+        cached = send(compile_agent_prompt, system_message, args.requests, prefix_cache=True)
+        print(f"{name:20} " + " ".join(f"{size:7.0f} B {build:6.1f} us" for build, size in (legacy, compiled, cached)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Shows the shared search cache against the fake search backend: many concurrent users searching a
+handful of queries should reach the backend once per distinct query, paced by the rate limiter.
+
+    python -m benchmarks.bench_search --users 50 --queries 5
+    python -m benchmarks.bench_search --users 50 --queries 5 --use-async
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.search_cache import CachedSearch, RateLimiter
+from agents.fakes import FakeSearch
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake search latency in seconds")
+    parser.add_argument("--use-async", action="store_true", help="search through arun from one event loop")
+    args = parser.parse_args()
+
+    backend = FakeSearch(args.latency)
+    search = CachedSearch(backend, rate_limiter=RateLimiter(rate=2.0, burst=3))
+    queries = [f"AI Engineer in City {i % args.queries}" for i in range(args.users)]
+    for round_name in ("cold", "warm"):
+        round_queries = [q.upper() if round_name == "warm" else q for q in queries]
+        start = time.perf_counter()
+        if args.use_async:
+            async def search_all():
+                return await asyncio.gather(*(search.arun(q) for q in round_queries))
+            asyncio.run(search_all())
+        else:
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                list(pool.map(search.run, round_queries))
+        print(f"{round_name}: {args.users} searches in {time.perf_counter() - start:.2f}s, backend calls so far {backend.calls}")
+    print(search.stats())
+
+if __name__ == "__main__":
+    main()
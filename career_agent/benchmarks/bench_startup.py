@@ -0,0 +1,70 @@
+"""
+Startup benchmark for CI: import time of app.py from `python -X importtime` and the
+wall-clock time from process start until the first page is served.
+
+    python -m benchmarks.bench_startup --json startup.json
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+def import_times(top=10):
+    env = dict(os.environ, GOOGLE_API_KEY=os.environ.get("GOOGLE_API_KEY", "benchmark"))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            capture_output=True, text=True, env=env, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    total_us = sum(self_us for _, self_us, _ in modules)
+    heaviest = sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+    return total_us / 1e6, [{"module": name, "cumulative_s": cumulative / 1e6} for name, _, cumulative in heaviest]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_first_page(timeout=120):
+    port = free_port()
+    env = dict(os.environ, GRADIO_SERVER_PORT=str(port), GOOGLE_API_KEY=os.environ.get("GOOGLE_API_KEY", "benchmark"))
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "app.py"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError(f"app did not serve a page within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    import_s, heaviest = import_times()
+    first_page_s = time_to_first_page()
+    results = {"import_s": round(import_s, 3), "first_page_s": round(first_page_s, 3), "heaviest_imports": heaviest}
+    print(f"import app:         {import_s:.2f} s")
+    print(f"first page served: {first_page_s:.2f} s")
+    for module in heaviest:
+        print(f"  {module['cumulative_s']:6.2f} s  {module['module']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Prompt size and trimming cost per turn over long synthetic conversations, comparing the
+old fixed 10 message cut with the token budget trimmer (with and without memoized counts).
+
+    python -m benchmarks.bench_trimming --turns 300
+"""
+import argparse
+import random
+import time
+from config.settings import HISTORY_TOKEN_BUDGET
+from utils import token_budget
+from utils.token_budget import TokenBudgetTrimmer, message_tokens
+
+def synthetic_messages(turns, seed=7):
+    rng = random.Random(seed)
+    words = "model prompt vector retrieval python agent embedding latency deploy resume skills".split()
+    for turn in range(turns):
+        # Mostly one-liners, with the occasional pasted resume or job description
+        length = rng.choice([8, 12, 20, 40, 2500]) if turn % 9 else 3000
+        yield {"role": "user", "content": " ".join(rng.choice(words) for _ in range(length))}
+        yield {"role": "assistant", "content": " ".join(rng.choice(words) for _ in range(rng.randint(40, 300)))}
+
+def fixed_cut(messages):
+    return messages[-10:]
+
+def simulate(trim, turns):
+    history, sizes, cost = [], [], 0.0
+    messages = list(synthetic_messages(turns))
+    for user, reply in zip(messages[::2], messages[1::2]):
+        start = time.perf_counter()
+        prompt = trim(history + [user])
+        cost += time.perf_counter() - start
+        sizes.append(sum(message_tokens(m) for m in prompt))
+        history = prompt + [reply]
+    return sum(sizes) / len(sizes), max(sizes), cost / turns * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--budget", type=int, default=HISTORY_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    trimmer = TokenBudgetTrimmer(args.budget)
+    cached = token_budget.estimate_tokens
+    for name, trim in [("fixed 10 messages", fixed_cut), ("token budget", trimmer.trim)]:
+        cached.cache_clear()
+        mean, peak, cost = simulate(trim, args.turns)
+        print(f"{name:28} prompt mean {mean:7.0f} tokens, max {peak:7.0f}, trim {cost:8.1f} us/turn")
+    token_budget.estimate_tokens = cached.__wrapped__
+    try:
+        mean, peak, cost = simulate(TokenBudgetTrimmer(args.budget).trim, args.turns)
+        print(f"{'token budget, no memo':28} prompt mean {mean:7.0f} tokens, max {peak:7.0f}, trim {cost:8.1f} us/turn")
+    finally:
+        token_budget.estimate_tokens = cached
+
+if __name__ == "__main__":
+    main()
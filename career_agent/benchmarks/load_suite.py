@@ -0,0 +1,177 @@
+"""
+Multi-user load suite for the whole Gradio app. The app is started in a subprocess on the
+fake model and fake search, and simulated users drive every tab through the Gradio client
+API in scripted sessions. The suite reports throughput, latency percentiles per endpoint,
+server memory growth per session and thread counts, and writes them as JSON so runs on two
+commits can be diffed.
+
+    python -m benchmarks.load_suite --users 20 --sessions 3 --output load_results.json
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from gradio_client import Client
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME = "Python developer with 3 years of experience building LangChain and RAG applications on GCP."
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def process_status(pid):
+    """Returns (resident memory in KB, thread count) of a process, from /proc."""
+    status = {}
+    with open(f"/proc/{pid}/status") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            status[key] = value.split()
+    return int(status["VmRSS"][0]), int(status["Threads"][0])
+
+def start_app(port, folder, latency, tokens_per_second, search_latency, search_rate_limit, search_burst):
+    env = dict(os.environ, GRADIO_SERVER_PORT=str(port), GRADIO_ANALYTICS_ENABLED="False", GOOGLE_API_KEY="benchmark",
+               MODEL_BACKEND="fake", SEARCH_BACKEND="fake", FAKE_MODEL_LATENCY=str(latency),
+               FAKE_MODEL_TOKENS_PER_SECOND=str(tokens_per_second),
+               FAKE_SEARCH_LATENCY=str(search_latency), METRICS_PORT="0", CACHE_DIR=os.path.join(folder, "cache"),
+               # The search rate limit protects DuckDuckGo; against the fake search it would only measure the limiter
+               SEARCH_RATE_LIMIT=str(search_rate_limit), SEARCH_BURST=str(search_burst),
+               # Every request should reach the model, as it would with distinct users
+               RESPONSE_CACHE_ENABLED="false")
+    server = subprocess.Popen([sys.executable, os.path.join(APP_DIR, "app.py")], cwd=folder, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("The app exited during startup")
+            time.sleep(0.5)
+    server.kill()
+    raise RuntimeError("The app did not start within 120 seconds")
+
+def session_script(user, session):
+    """The calls one scripted session makes, as (endpoint, args), covering every tab."""
+    tag = f"{user}-{session}"
+    return [
+        ("/tutorial", (f"Tutorial on vector databases {tag}", False)),
+        ("/learning_path", (f"Topic {tag}",)),
+        ("/ask", (f"What is an embedding? {tag}", [])),
+        ("/interview_questions", (f"LLM engineer questions {tag}",)),
+        ("/interview_start", ("Generative AI Engineer",)),
+        ("/interview_answer", (f"I would start from the retrieval quality {tag}", [{"role": "assistant", "content": "Q1"}])),
+        ("/interview_answer", (f"Then evaluate groundedness {tag}", [{"role": "assistant", "content": "Q1"}])),
+        ("/interview_report", ([{"role": "assistant", "content": "Q1"}],)),
+        ("/resume", (f"{RESUME} {tag}", False)),
+        ("/job_search", (f"ML Engineer in City {tag}",)),
+        ("/match_jobs", (RESUME, 10)),
+    ]
+
+def endpoint_stats(values, errors):
+    """Calls attempted, errors and latency percentiles of the successful calls (None when there were none)."""
+    calls = len(values) + errors
+    return {
+        "calls": calls,
+        "errors": errors,
+        "error_rate": round(errors / calls, 3) if calls else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 1) if values else None,
+        "p95_ms": round(percentile(values, 95) * 1000, 1) if values else None,
+        "p99_ms": round(percentile(values, 99) * 1000, 1) if values else None,
+    }
+
+def run_user(url, user, sessions, latencies, errors):
+    for session in range(sessions):
+        # A new client is a new browser session, with its own Gradio session hash
+        client = Client(url, verbose=False)
+        for endpoint, args in session_script(user, session):
+            start = time.perf_counter()
+            try:
+                client.predict(*args, api_name=endpoint)
+            except Exception as e:
+                errors.setdefault(endpoint, []).append(repr(e)[:200])
+                continue
+            latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20, help="simulated concurrent users")
+    parser.add_argument("--sessions", type=int, default=3, help="scripted sessions per user")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency per call in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="fake model streaming speed")
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    parser.add_argument("--search-rate-limit", type=float, default=1000,
+                        help="searches per second allowed by the app's limiter (the app default is 1)")
+    parser.add_argument("--search-burst", type=int, default=1000, help="burst size of the app's search limiter")
+    parser.add_argument("--output", default="load_results.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        port = free_port()
+        server = start_app(port, folder, args.latency, args.tokens_per_second, args.search_latency,
+                           args.search_rate_limit, args.search_burst)
+        try:
+            url = f"http://127.0.0.1:{port}/"
+            # One warm-up session builds the agents and imports, so they do not count as growth per session
+            run_user(url, "warmup", 1, {}, {})
+            rss_start, threads_start = process_status(server.pid)
+            samples, done = [], threading.Event()
+
+            def sample():
+                while not done.is_set():
+                    samples.append(process_status(server.pid))
+                    done.wait(0.2)
+
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+            latencies, errors = {}, {}
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                users = [pool.submit(run_user, url, user, args.sessions, latencies, errors) for user in range(args.users)]
+            for user in users:
+                user.result()
+            elapsed = time.perf_counter() - start
+            done.set()
+            sampler.join()
+            rss_end, threads_end = process_status(server.pid)
+        finally:
+            server.terminate()
+            server.wait(30)
+
+    calls = sum(len(values) for values in latencies.values())
+    sessions = args.users * args.sessions
+    everything = [value for values in latencies.values() for value in values]
+    results = {
+        "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True, text=True).stdout.strip(),
+        "config": vars(args),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput": {"calls_per_second": round(calls / elapsed, 2), "sessions_per_minute": round(sessions / elapsed * 60, 2)},
+        "latency_ms": {"p50": round(percentile(everything, 50) * 1000, 1), "p95": round(percentile(everything, 95) * 1000, 1),
+                       "p99": round(percentile(everything, 99) * 1000, 1)} if everything else {},
+        # Every attempted endpoint is listed, so one whose calls all failed shows a 100% error rate
+        "endpoints": {endpoint: endpoint_stats(latencies.get(endpoint, []), len(errors.get(endpoint, [])))
+                      for endpoint in sorted(set(latencies) | set(errors))},
+        "errors": {endpoint: messages[:3] for endpoint, messages in errors.items()},
+        "memory_kb": {"start": rss_start, "peak": max([rss for rss, _ in samples] + [rss_end]), "end": rss_end,
+                      "growth_per_session": round((rss_end - rss_start) / sessions, 1)},
+        "threads": {"start": threads_start, "peak": max([count for _, count in samples] + [threads_end]), "end": threads_end},
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps({key: results[key] for key in ("throughput", "latency_ms", "memory_kb", "threads")}, indent=2))
+    print(f"{calls} calls by {args.users} users, {sum(len(v) for v in errors.values())} errors; saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Load test for the async request path. Simulated users call the async agent methods
+against the fake model with injected latency, limited by CONCURRENCY_LIMIT the same way
+the Gradio queue limits them, and the harness reports latency percentiles and throughput.
+
+    python -m benchmarks.load_test --requests 200 --latency 0.5 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from agents.learning_agent import LearningResourceAgent
+from config.settings import TUTORIAL_SYSTEM_MESSAGE, QUERY_SYSTEM_MESSAGE, CONCURRENCY_LIMIT
+from benchmarks.stubs import stub_agent
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def run(requests, latency, concurrency):
+    tutorial_agent = stub_agent(LearningResourceAgent, TUTORIAL_SYSTEM_MESSAGE, latency=latency)
+    query_agent = stub_agent(LearningResourceAgent, QUERY_SYSTEM_MESSAGE, latency=latency)
+    tutorial_agent.agent_executor.verbose = False
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def user(i):
+        async with limit:
+            start = time.perf_counter()
+            if i % 2:
+                await tutorial_agent.atutorial_agent(f"Tutorial on topic {i}")
+            else:
+                await query_agent.aquery_bot(f"Question {i}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5, help="injected model latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY_LIMIT)
+    args = parser.parse_args()
+
+    latencies, elapsed = asyncio.run(run(args.requests, args.latency, args.concurrency))
+    print(f"requests:   {args.requests} (concurrency {args.concurrency}, model latency {args.latency}s)")
+    print(f"p50:        {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"p99:        {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s")
+
+if __name__ == "__main__":
+    main()
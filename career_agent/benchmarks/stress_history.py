@@ -0,0 +1,55 @@
+"""
+Stress check for per-session chat history: N parallel sessions chat through one agent,
+then every session's history is checked to contain only its own messages and the
+store is checked to stay within its session limit.
+
+    python -m benchmarks.stress_history --sessions 500 --turns 6 --max-sessions 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from agents.learning_agent import LearningResourceAgent
+from config.settings import QUERY_SYSTEM_MESSAGE
+from utils.history import InMemoryHistoryStore, SQLiteHistoryStore
+from benchmarks.stubs import stub_agent
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+def run(store, sessions, turns, max_sessions):
+    agent = stub_agent(LearningResourceAgent, QUERY_SYSTEM_MESSAGE, reply="ok")
+    agent.history_store = store
+
+    def session(i):
+        session_id = f"session-{i}"
+        for turn in range(turns):
+            agent.query_bot(f"{session_id} question {turn}", session_id)
+        history = store.get(session_id)
+        # An evicted session comes back empty, which is allowed; foreign messages are not
+        return all(m["content"].startswith(session_id) for m in history if m["role"] == "user")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    isolated = all(results)
+    print(f"{type(store).__name__}: {sessions * turns / elapsed:.0f} turns/s, "
+          f"isolated={isolated}, sessions stored={len(store)} (limit {max_sessions})")
+    assert isolated, "a session saw messages from another session"
+    assert len(store) <= max_sessions, "history store grew past its session limit"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--max-sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    run(InMemoryHistoryStore(args.max_sessions), args.sessions, args.turns, args.max_sessions)
+    with tempfile.TemporaryDirectory() as folder:
+        store = SQLiteHistoryStore(os.path.join(folder, "history.db"), max_sessions=args.max_sessions)
+        run(store, args.sessions, args.turns, args.max_sessions)
+
+if __name__ == "__main__":
+    main()
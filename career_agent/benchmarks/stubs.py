@@ -0,0 +1,11 @@
+from agents.fakes import FakeChatModel
+
+def stub_agent(agent_cls, system_message, **model_kwargs):
+    """Builds an agent of the given class on a FakeChatModel configured with model_kwargs.
+
+    The response cache is switched off so every call reaches the model.
+    """
+    agent = agent_cls(system_message)
+    agent.model = FakeChatModel(**model_kwargs)
+    agent.response_cache = None
+    return agent
@@ -6,6 +6,91 @@ load_dotenv()
 # Configuration settings
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
+# Chat model and web search backends, see agents/models.py ("gemini" or "fake", "duckduckgo" or "fake")
+MODEL_BACKEND = os.getenv('MODEL_BACKEND', 'gemini')
+MODEL_NAME = os.getenv('MODEL_NAME', 'gemini-1.5-pro')
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'duckduckgo')
+
+# Offline fake backends: seconds before the first token, reply speed (0 for instant) and whether to call the search tool first
+FAKE_MODEL_LATENCY = float(os.getenv('FAKE_MODEL_LATENCY', '0.5'))
+FAKE_MODEL_TOKENS_PER_SECOND = float(os.getenv('FAKE_MODEL_TOKENS_PER_SECOND', '50'))
+FAKE_MODEL_TOOL_CALLS = os.getenv('FAKE_MODEL_TOOL_CALLS', 'true').lower() == 'true'
+FAKE_SEARCH_LATENCY = float(os.getenv('FAKE_SEARCH_LATENCY', '0.3'))
+
+# Number of requests each Gradio event handler may run at the same time
+CONCURRENCY_LIMIT = int(os.getenv('CONCURRENCY_LIMIT', '16'))
+
+# Stream tutorials, resumes and job listings to the UI token by token
+STREAM_OUTPUT = os.getenv('STREAM_OUTPUT', 'true').lower() == 'true'
+
+# Local storage for caches and indexes
+CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+
+# Response cache for tutorials, interview questions, resumes and job searches
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_PATH = os.path.join(CACHE_DIR, 'responses.db')
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1000'))
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', str(24 * 60 * 60)))
+# Cosine similarity needed to reuse the answer of a similar prompt, 0 (the default) disables the
+# similarity tier. The local hashing embedder scores different topics above 0.9, so keep it high.
+RESPONSE_CACHE_SIMILARITY = float(os.getenv('RESPONSE_CACHE_SIMILARITY', '0'))
+
+# DuckDuckGo results shared by all agents
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', '900'))
+SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '512'))
+# Searches per second sent to DuckDuckGo, with short bursts of up to SEARCH_BURST
+SEARCH_RATE_LIMIT = float(os.getenv('SEARCH_RATE_LIMIT', '1.0'))
+SEARCH_BURST = int(os.getenv('SEARCH_BURST', '3'))
+
+# Index of every job listing found, for filtering without new searches
+JOB_INDEX_PATH = os.path.join(CACHE_DIR, 'jobs.db')
+
+# Corpus size from which resume matching switches to an approximate nearest neighbour index, 0 to always scan
+MATCH_ANN_THRESHOLD = int(os.getenv('MATCH_ANN_THRESHOLD', '200000'))
+
+# Batch job search: searches run at the same time and seconds allowed per search
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+BATCH_TIMEOUT = float(os.getenv('BATCH_TIMEOUT', '120'))
+
+# Per-session chat history for the Q&A bot and mock interview ("memory" or "sqlite")
+HISTORY_BACKEND = os.getenv('HISTORY_BACKEND', 'memory')
+HISTORY_DB_PATH = os.path.join(CACHE_DIR, 'history.db')
+HISTORY_MAX_SESSIONS = int(os.getenv('HISTORY_MAX_SESSIONS', '1000'))
+HISTORY_IDLE_TIMEOUT = int(os.getenv('HISTORY_IDLE_TIMEOUT', '3600'))
+# Estimated tokens of history sent with each chat message
+HISTORY_TOKEN_BUDGET = int(os.getenv('HISTORY_TOKEN_BUDGET', '4000'))
+# Summarize messages that fall out of the budget instead of dropping them (one extra model call when it happens)
+HISTORY_SUMMARIZE = os.getenv('HISTORY_SUMMARIZE', 'false').lower() == 'true'
+
+# Prometheus /metrics and OTLP JSON /traces endpoint, only started when METRICS_PORT is set (e.g. 9464).
+# It listens on localhost unless METRICS_HOST says otherwise.
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# Structured mock interview: planned questions per interview and threads scoring answers in the background
+INTERVIEW_QUESTION_COUNT = int(os.getenv('INTERVIEW_QUESTION_COUNT', '8'))
+INTERVIEW_SCORING_WORKERS = int(os.getenv('INTERVIEW_SCORING_WORKERS', '4'))
+
+# Background generation jobs: workers are threads or processes, and a job whose worker stops
+# renewing its lease for JOB_QUEUE_LEASE seconds is retried up to JOB_QUEUE_MAX_ATTEMPTS times
+JOB_QUEUE_PATH = os.path.join(CACHE_DIR, 'job_queue.db')
+JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', '2'))
+JOB_QUEUE_MODE = os.getenv('JOB_QUEUE_MODE', 'thread')
+JOB_QUEUE_LEASE = int(os.getenv('JOB_QUEUE_LEASE', '300'))
+JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv('JOB_QUEUE_MAX_ATTEMPTS', '3'))
+
+# Learning paths: topics, prerequisites and tutorial sections shared between paths
+LEARNING_GRAPH_PATH = os.path.join(CACHE_DIR, 'learning_graph.db')
+# Levels of prerequisites planned below the requested topic, and prerequisites kept per topic
+LEARNING_PATH_DEPTH = int(os.getenv('LEARNING_PATH_DEPTH', '2'))
+LEARNING_PATH_MAX_PREREQUISITES = int(os.getenv('LEARNING_PATH_MAX_PREREQUISITES', '4'))
+
+# Archive of generated outputs: compressed, deduplicated content with a searchable catalog.
+# Entries older than ARCHIVE_RETENTION_DAYS or beyond the newest ARCHIVE_MAX_PER_KIND of a kind are dropped (0 keeps them)
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'Agent_archive')
+ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '90'))
+ARCHIVE_MAX_PER_KIND = int(os.getenv('ARCHIVE_MAX_PER_KIND', '1000'))
+
 # System messages
 TUTORIAL_SYSTEM_MESSAGE = '''You are a knowledgeable assistant specializing as a Senior Generative AI Developer with extensive experience in both development and tutoring.
      Additionally, you are an experienced blogger who creates tutorials focused on Generative AI.
@@ -13,6 +98,15 @@ TUTORIAL_SYSTEM_MESSAGE = '''You are a knowledgeable assistant specializing as a
      Ensure tutorial includes clear explanations, well-structured python code, comments, and fully functional code examples.
      Provide resource reference links at the end of each tutorial for further learning.'''
 
+LEARNING_SECTION_MESSAGE = '''You are a Senior Generative AI Developer and tutorial writer.
+     Write one self-contained section of a learning path in markdown for the topic given by the user.
+     Start with a `##` heading naming the topic, explain the core ideas, include a short well-commented python example
+     and end with two or three reference links. Do not re-explain prerequisite topics; they have their own sections.'''
+
+LEARNING_PATH_PLAN_MESSAGE = '''You plan learning paths for Generative AI topics.
+     List the direct prerequisite topics someone should learn before the topic given by the user, most fundamental first.
+     Return only a numbered list of short topic names, one per line, or nothing if the topic has no prerequisites.'''
+
 QUERY_SYSTEM_MESSAGE = '''You are an expert Generative AI Engineer with extensive experience in training and guiding others in AI engineering.
     You have a strong track record of solving complex problems and addressing various challenges in AI.
     Your role is to assist users by providing insightful solutions and expert advice on their queries.'''
@@ -21,10 +115,13 @@ INTERVIEW_QUESTIONS_MESSAGE = '''You are a good researcher in finding interview
                      Your task is to provide a list of interview questions for Generative AI topics and job based on user requirements.
                      Provide top questions with references and links if possible.'''
 
-MOCK_INTERVIEW_MESSAGE = '''You are a Generative AI Interviewer. You have conducted numerous interviews for Generative AI roles.
-         Your task is to conduct a mock interview for a Generative AI position, engaging in a back-and-forth interview session.
-         The conversation should not exceed more than 15 to 20 minutes.
-         At the end of the interview, provide an evaluation for the candidate.'''
+INTERVIEW_PLAN_MESSAGE = '''You are a Generative AI Interviewer planning a mock interview for the role given by the user.
+         Write the requested number of interview questions, moving from fundamentals to system design and past experience.
+         Return only a numbered list with one question per line.'''
+
+INTERVIEW_SCORING_MESSAGE = '''You are a Generative AI Interviewer evaluating one answer from a mock interview.
+         Start with a line of the form "Score: N/10", then give two or three sentences of feedback
+         on what was strong and what was missing.'''
 
 RESUME_SYSTEM_MESSAGE = '''You are a skilled resume expert with extensive experience in crafting resumes tailored for tech roles, especially in AI and Generative AI.
     Your task is to create a resume template for an AI Engineer specializing in Generative AI, incorporating trending keywords and technologies in the current job market.
@@ -40,4 +137,5 @@ JOB_SEARCH_MESSAGE = '''You are a job search assistant. Based on the search resu
        - Experience Level
        - Job Description (summarized)
        - Application Link (if available)
-    Format the output in clean markdown with proper sections and bullet points.''' 
\ No newline at end of file
+    Format the output in clean markdown with proper sections and bullet points.
+    Start each listing with a `### Job Title` heading followed by one `- **Label:** value` bullet per field.''' 
\ No newline at end of file
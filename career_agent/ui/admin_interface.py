@@ -0,0 +1,25 @@
+import json
+import gradio as gr
+from utils.file_handler import output_store
+from utils.tracing import tracer
+
+def create_admin_interface():
+    def refresh():
+        rows = [[stage, count, round(p50 * 1000, 1), round(p95 * 1000, 1)]
+                for stage, count, p50, p95 in tracer.stage_summary()]
+        counters = "\n".join(f"- **{name}:** {value:g}" for name, value in sorted(tracer.counters.items()))
+        return rows, counters or "_No requests traced yet._"
+
+    def export_traces():
+        return output_store.write(json.dumps(tracer.export_otlp_json()), "Traces", "json")
+
+    with gr.Tab("Admin"):
+        gr.Markdown("Latency per stage over the most recent requests. The same data is served at `/metrics` and `/traces` on METRICS_PORT when it is set.")
+        stage_table = gr.Dataframe(headers=["Stage", "Count", "p50 (ms)", "p95 (ms)"], interactive=False)
+        counters_output = gr.Markdown()
+        with gr.Row():
+            refresh_button = gr.Button("Refresh")
+            export_button = gr.Button("Export Traces")
+        traces_file = gr.File(label="Traces (OTLP JSON)")
+        refresh_button.click(refresh, outputs=[stage_table, counters_output], queue=False)
+        export_button.click(export_traces, outputs=[traces_file])
@@ -0,0 +1,33 @@
+from datetime import datetime
+import gradio as gr
+from utils.archive import get_archive
+from utils.file_handler import output_store
+
+KINDS = ["All", "Tutorial", "Resume", "Learning_path", "Interview_questions", "Mock_interview_report",
+         "Job_search", "Job_search_batch"]
+
+def create_archive_interface():
+    def search(kind, text, mine, request: gr.Request):
+        entries = get_archive().search(kind=None if kind == "All" else kind, text=text,
+                                       user=request.session_hash if mine else None)
+        return [[entry["id"], entry["kind"], datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M"),
+                 entry["title"], entry["prompt"][:120]] for entry in entries]
+
+    def open_entry(evt: gr.SelectData):
+        entry = get_archive().get(int(evt.row_value[0]))
+        if entry is None:
+            return "_This output was removed by the retention policy._", None
+        return entry["content"], output_store.write(entry["content"], entry["kind"])
+
+    with gr.Tab("Archive"):
+        with gr.Row():
+            kind_input = gr.Dropdown(KINDS, value="All", label="Kind")
+            text_input = gr.Textbox(label="Search prompts and titles")
+            mine_input = gr.Checkbox(label="Only outputs from this session")
+        search_button = gr.Button("Search")
+        results = gr.Dataframe(headers=["ID", "Kind", "Created", "Title", "Prompt"], interactive=False)
+        gr.Markdown("Select a row to reopen the output without generating it again.")
+        archive_output = gr.Markdown(label="Archived Output")
+        archive_file = gr.File(label="Download")
+        search_button.click(search, inputs=[kind_input, text_input, mine_input], outputs=[results], queue=False)
+        results.select(open_entry, outputs=[archive_output, archive_file])
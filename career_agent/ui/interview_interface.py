@@ -1,28 +1,50 @@
 import gradio as gr
 from agents.interview_agent import InterviewAgent
-from config.settings import INTERVIEW_QUESTIONS_MESSAGE, MOCK_INTERVIEW_MESSAGE
+from agents.interview_engine import InterviewEngine
+from config.settings import INTERVIEW_QUESTIONS_MESSAGE
 
 def create_interview_interface():
     interview_agent = InterviewAgent(INTERVIEW_QUESTIONS_MESSAGE)
-    mock_interview_agent = InterviewAgent(MOCK_INTERVIEW_MESSAGE)
+    interview_engine = InterviewEngine()
     
     with gr.Tab("Interview Preparation"):
         with gr.Tab("Interview Questions"):
             question_input = gr.Textbox(label="What type of interview questions would you like?", lines=3)
             question_output = gr.Markdown(label="Interview Questions")
             question_button = gr.Button("Get Questions")
-            question_button.click(interview_agent.get_interview_questions, inputs=[question_input], outputs=[question_output])
+            question_button.click(interview_agent.aget_interview_questions, inputs=[question_input], outputs=[question_output], api_name="interview_questions")
             
         with gr.Tab("Mock Interview"):
+            role_input = gr.Textbox(label="Role you are interviewing for", value="Generative AI Engineer")
+            start = gr.Button("Start Interview")
             chatbot = gr.Chatbot(type="messages")
             msg = gr.Textbox(label="Your Response")
-            clear = gr.Button("Clear")
+            with gr.Row():
+                finish = gr.Button("Finish and Evaluate")
+                clear = gr.Button("Clear")
+            report_output = gr.Markdown(label="Interview Report")
             
-            def respond(message, history):
-                bot_message = mock_interview_agent.mock_interview(message)
+            async def start_interview(role, request: gr.Request):
+                question = await interview_engine.astart(role, request.session_hash)
+                return [{"role": "assistant", "content": question}], ""
+            
+            async def respond(message, history, request: gr.Request):
+                if not history:
+                    return message, history
+                # Answers are scored in the background, so the next question comes straight from the plan
+                question = await interview_engine.aanswer(message, request.session_hash)
                 history.append({"role": "user", "content": message})
-                history.append({"role": "assistant", "content": bot_message})
+                history.append({"role": "assistant", "content": question or "That was the last question. Click \"Finish and Evaluate\" for your report."})
                 return "", history
             
-            msg.submit(respond, [msg, chatbot], [msg, chatbot])
-            clear.click(lambda: None, None, chatbot, queue=False) 
\ No newline at end of file
+            async def finish_interview(history, request: gr.Request):
+                return await interview_engine.areport(request.session_hash)
+            
+            start.click(start_interview, [role_input], [chatbot, report_output], api_name="interview_start")
+            msg.submit(respond, [msg, chatbot], [msg, chatbot], api_name="interview_answer")
+            finish.click(finish_interview, [chatbot], [report_output], api_name="interview_report")
+            def clear_chat(request: gr.Request):
+                interview_engine.clear(request.session_hash)
+                return [], ""
+            
+            clear.click(clear_chat, None, [chatbot, report_output], queue=False)
@@ -1,12 +1,62 @@
+import asyncio
+import time
 import gradio as gr
-from agents.job_search_agent import JobSearch
-from config.settings import JOB_SEARCH_MESSAGE
+from agents.job_search_agent import JobSearch, parse_job_queries
+from config.settings import JOB_SEARCH_MESSAGE, STREAM_OUTPUT, BATCH_CONCURRENCY
 
 def create_job_search_interface():
     job_search = JobSearch(JOB_SEARCH_MESSAGE)
     
+    async def run_batch(csv_path, concurrency):
+        if not csv_path:
+            yield [], "_Upload a CSV with title and location columns first._", None
+            return
+        try:
+            with open(csv_path, "r", encoding="utf-8") as f:
+                queries = parse_job_queries(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            yield [], f"_Could not read the CSV: {e}_", None
+            return
+        if not queries:
+            yield [], "_The CSV has no searches. Give one per row, with title and location columns (or a header row naming them)._", None
+            return
+        results, rows = [], []
+        async for result in job_search.afind_jobs_batch(queries, int(concurrency)):
+            results.append(result)
+            rows.append([result["query"], result["status"], round(result["seconds"], 1)])
+            yield rows, f"{len(results)} of {len(queries)} searches finished", None
+        report, report_path = await asyncio.to_thread(job_search.save_batch_report, results)
+        yield rows, report, report_path
+    
+    def filter_saved(skills, location, experience_level, text):
+        start = time.perf_counter()
+        listings = job_search.filter_listings(skills, location, experience_level, text)
+        summary = f"_{len(listings)} listings in {(time.perf_counter() - start) * 1000:.1f} ms_"
+        return "\n\n".join([summary] + [listing.to_markdown() for listing in listings])
+    
     with gr.Tab("Job Search"):
         job_input = gr.Textbox(label="Enter job title and location (e.g., 'AI Engineer in San Francisco')")
         job_output = gr.Markdown(label="Job Listings")
         job_button = gr.Button("Search Jobs")
-        job_button.click(job_search.find_jobs, inputs=[job_input], outputs=[job_output]) 
\ No newline at end of file
+        find_jobs = job_search.astream_jobs if STREAM_OUTPUT else job_search.afind_jobs
+        job_button.click(find_jobs, inputs=[job_input], outputs=[job_output], api_name="job_search") 
+    
+    with gr.Tab("Batch Job Search"):
+        batch_input = gr.File(label="CSV with title and location columns", file_types=[".csv"], type="filepath")
+        batch_concurrency = gr.Slider(1, 16, value=BATCH_CONCURRENCY, step=1, label="Searches at a time")
+        batch_button = gr.Button("Search All")
+        batch_progress = gr.Dataframe(headers=["Query", "Status", "Seconds"], label="Progress")
+        batch_report = gr.Markdown(label="Report")
+        batch_file = gr.File(label="CSV report")
+        batch_button.click(run_batch, inputs=[batch_input, batch_concurrency], outputs=[batch_progress, batch_report, batch_file])
+    
+    with gr.Tab("Saved Listings"):
+        with gr.Row():
+            skills_filter = gr.Textbox(label="Skills (comma separated)")
+            location_filter = gr.Textbox(label="Location")
+            level_filter = gr.Textbox(label="Experience level")
+            text_filter = gr.Textbox(label="Any text")
+        saved_output = gr.Markdown(label="Listings")
+        filters = [skills_filter, location_filter, level_filter, text_filter]
+        for box in filters:
+            box.change(filter_saved, inputs=filters, outputs=[saved_output], queue=False)
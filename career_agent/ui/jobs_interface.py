@@ -0,0 +1,48 @@
+import asyncio
+import time
+import gradio as gr
+from utils.job_queue import get_job_queue
+
+def job_status(job):
+    if job is None:
+        return "_No job with this id._"
+    header = f"_Job `{job['id']}`: {job['status']}"
+    if job["attempts"] > 1:
+        header += f" (attempt {job['attempts']})"
+    header += "_"
+    if job["status"] == "done":
+        return job["result"]
+    if job["status"] == "failed":
+        return f"{header}\n\n```\n{job['error']}\n```"
+    return f"{header}\n\n{job['progress']}" if job["progress"] else header
+
+async def poll_job(job_id, interval=1.0):
+    """Yields the job's status and partial output until it finishes; the job keeps running if the page is closed."""
+    queue = get_job_queue()
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        yield job_status(job)
+        if job is None or job["status"] in ("done", "failed"):
+            return
+        await asyncio.sleep(interval)
+
+async def run_in_background(kind, user_input, user=None):
+    job_id = await asyncio.to_thread(get_job_queue().enqueue, kind, {"input": user_input, "user": user})
+    async for status in poll_job(job_id):
+        yield status
+
+def create_jobs_interface():
+    def list_jobs():
+        now = time.time()
+        return [[job["id"], job["kind"], job["status"], job["attempts"],
+                 f"{(job['finished'] or now) - (job['started'] or now):.1f}"]
+                for job in get_job_queue().recent()]
+
+    with gr.Tab("Background Jobs"):
+        jobs_table = gr.Dataframe(headers=["Job ID", "Kind", "Status", "Attempts", "Seconds"], interactive=False)
+        refresh_button = gr.Button("Refresh")
+        job_id_input = gr.Textbox(label="Job ID")
+        job_output = gr.Markdown(label="Job Result")
+        show_button = gr.Button("Show Job")
+        refresh_button.click(list_jobs, outputs=[jobs_table])
+        show_button.click(poll_job, inputs=[job_id_input], outputs=[job_output])
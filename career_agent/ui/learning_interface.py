@@ -1,34 +1,54 @@
 import gradio as gr
 from agents.learning_agent import LearningResourceAgent
-from config.settings import TUTORIAL_SYSTEM_MESSAGE, QUERY_SYSTEM_MESSAGE
+from agents.learning_path import LearningPathAgent
+from ui.jobs_interface import run_in_background
+from config.settings import TUTORIAL_SYSTEM_MESSAGE, QUERY_SYSTEM_MESSAGE, STREAM_OUTPUT
 
 def create_learning_interface():
     learning_agent = LearningResourceAgent(TUTORIAL_SYSTEM_MESSAGE)
     query_agent = LearningResourceAgent(QUERY_SYSTEM_MESSAGE)
+    path_agent = LearningPathAgent()
     
-    def handle_tutorial(query):
-        return learning_agent.tutorial_agent(query)
+    async def handle_tutorial(query, background, request: gr.Request):
+        if background:
+            async for status in run_in_background("tutorial", query, request.session_hash):
+                yield status
+        elif STREAM_OUTPUT:
+            async for partial in learning_agent.astream_tutorial(query, request.session_hash):
+                yield partial
+        else:
+            yield await learning_agent.atutorial_agent(query, request.session_hash)
     
-    def handle_query(query):
-        return query_agent.query_bot(query)
+    async def handle_query(query, session_id):
+        return await query_agent.aquery_bot(query, session_id)
     
     with gr.Tab("Learning Resources"):
         with gr.Tab("Tutorial Generator"):
             tutorial_input = gr.Textbox(label="What would you like to learn about?", lines=3)
+            tutorial_background = gr.Checkbox(label="Run in background (check back later in Background Jobs)")
             tutorial_output = gr.Markdown(label="Generated Tutorial")
             tutorial_button = gr.Button("Generate Tutorial")
-            tutorial_button.click(handle_tutorial, inputs=[tutorial_input], outputs=[tutorial_output])
+            tutorial_button.click(handle_tutorial, inputs=[tutorial_input, tutorial_background], outputs=[tutorial_output], api_name="tutorial")
+            
+        with gr.Tab("Learning Path"):
+            path_input = gr.Textbox(label="Topic to build a learning path for")
+            path_output = gr.Markdown(label="Learning Path")
+            path_button = gr.Button("Build Learning Path")
+            path_button.click(path_agent.alearning_path, inputs=[path_input], outputs=[path_output], api_name="learning_path")
             
         with gr.Tab("Q&A Bot"):
             chatbot = gr.Chatbot(type="messages")
             msg = gr.Textbox(label="Ask a question")
             clear = gr.Button("Clear")
             
-            def respond(message, history):
-                bot_message = handle_query(message)
+            async def respond(message, history, request: gr.Request):
+                bot_message = await handle_query(message, request.session_hash)
                 history.append({"role": "user", "content": message})
                 history.append({"role": "assistant", "content": bot_message})
                 return "", history
             
-            msg.submit(respond, [msg, chatbot], [msg, chatbot])
-            clear.click(lambda: None, None, chatbot, queue=False) 
\ No newline at end of file
+            msg.submit(respond, [msg, chatbot], [msg, chatbot], api_name="ask")
+            def clear_chat(request: gr.Request):
+                query_agent.clear_history(request.session_hash)
+            
+            clear.click(clear_chat, None, chatbot, queue=False) 
\ No newline at end of file
@@ -0,0 +1,24 @@
+import asyncio
+import time
+import gradio as gr
+from utils.matching import get_job_matcher
+
+def create_match_interface():
+    def match_jobs(resume, top_k):
+        start = time.perf_counter()
+        matcher = get_job_matcher()
+        matches = matcher.rank(resume, int(top_k))
+        if not matches:
+            return "_No saved listings yet. Run a job search first._"
+        summary = f"_Ranked {len(matcher.listings)} listings in {(time.perf_counter() - start) * 1000:.0f} ms_"
+        return "\n\n".join([summary] + [f"**Match {max(score, 0):.0%}**\n\n{listing.to_markdown()}" for score, listing in matches])
+    
+    async def handle_match(resume, top_k):
+        return await asyncio.to_thread(match_jobs, resume, top_k)
+    
+    with gr.Tab("Match Jobs"):
+        resume_input = gr.Textbox(label="Paste your resume", lines=10)
+        top_k = gr.Slider(5, 50, value=10, step=5, label="Number of matches")
+        match_output = gr.Markdown(label="Best Matching Jobs")
+        match_button = gr.Button("Match Jobs")
+        match_button.click(handle_match, inputs=[resume_input, top_k], outputs=[match_output], api_name="match_jobs")
@@ -1,12 +1,25 @@
 import gradio as gr
 from agents.resume_agent import ResumeMaker
-from config.settings import RESUME_SYSTEM_MESSAGE
+from ui.jobs_interface import run_in_background
+from config.settings import RESUME_SYSTEM_MESSAGE, STREAM_OUTPUT
 
 def create_resume_interface():
     resume_maker = ResumeMaker(RESUME_SYSTEM_MESSAGE)
     
     with gr.Tab("Resume Maker"):
         resume_input = gr.Textbox(label="Enter your details (skills, experience, education, etc.)", lines=10)
+        resume_background = gr.Checkbox(label="Run in background (check back later in Background Jobs)")
         resume_output = gr.Markdown(label="Generated Resume")
         resume_button = gr.Button("Generate Resume")
-        resume_button.click(resume_maker.create_resume, inputs=[resume_input], outputs=[resume_output]) 
\ No newline at end of file
+        
+        async def create_resume(details, background, request: gr.Request):
+            if background:
+                async for status in run_in_background("resume", details, request.session_hash):
+                    yield status
+            elif STREAM_OUTPUT:
+                async for partial in resume_maker.astream_resume(details, request.session_hash):
+                    yield partial
+            else:
+                yield await resume_maker.acreate_resume(details, request.session_hash)
+        
+        resume_button.click(create_resume, inputs=[resume_input, resume_background], outputs=[resume_output], api_name="resume") 
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Content addressed, compressed archive of agent outputs with a SQLite catalog
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from utils.response_cache import normalize_prompt
+from config.settings import ARCHIVE_DIR, ARCHIVE_RETENTION_DAYS, ARCHIVE_MAX_PER_KIND
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC = "zstd" if zstandard is not None else "zlib"
+_TITLE = re.compile(r"^\s*#+\s*(.+?)\s*$", re.MULTILINE)
+
+def compress(data, codec=CODEC):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+def decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This archive entry is zstd compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+def prompt_hash(prompt):
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest() if prompt else None
+
+class OutputArchive:
+    """Stores each distinct output once, compressed under its sha256, and catalogs every save of it.
+
+    Blobs are compressed with zstd when the zstandard package is installed and with zlib
+    otherwise; the codec is recorded per blob so archives stay readable either way. The
+    catalog keeps kind, user, prompt hash, title and time of each save, with full text
+    search over prompts and titles. Retention drops old catalog entries and then the blobs
+    no entry refers to any more.
+    """
+
+    def __init__(self, root, retention_days=90, max_per_kind=1000, retention_interval=100):
+        self.root = root
+        self.retention_days = retention_days
+        self.max_per_kind = max_per_kind
+        self.retention_interval = retention_interval
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "catalog.db"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER,
+                stored_size INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS outputs (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                user TEXT,
+                prompt_hash TEXT,
+                prompt TEXT,
+                title TEXT,
+                content_hash TEXT NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS outputs_kind ON outputs (kind, created);
+            CREATE INDEX IF NOT EXISTS outputs_prompt ON outputs (kind, prompt_hash, created);
+            CREATE INDEX IF NOT EXISTS outputs_user ON outputs (user, created);
+            CREATE VIRTUAL TABLE IF NOT EXISTS outputs_fts USING fts5(
+                prompt, title, content='outputs', content_rowid='id'
+            );
+        """)
+        self._db.commit()
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.root, "objects", content_hash[:2], content_hash[2:])
+
+    def put(self, content, kind, user=None, prompt=None):
+        """Archives content and returns its catalog entry id; identical content is stored only once."""
+        data = content.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        title = _TITLE.search(content)
+        title = title.group(1).strip("*# ") if title else content.strip()[:80]
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone() is None:
+                stored = compress(data)
+                path = self._blob_path(content_hash)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as file:
+                    file.write(stored)
+                os.replace(path + ".tmp", path)
+                self._db.execute("INSERT INTO blobs VALUES (?, ?, ?, ?)", (content_hash, CODEC, len(data), len(stored)))
+            entry_id = self._db.execute(
+                "INSERT INTO outputs (kind, user, prompt_hash, prompt, title, content_hash, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, user, prompt_hash(prompt), (prompt or "")[:1000], title, content_hash, time.time())).lastrowid
+            self._db.execute("INSERT INTO outputs_fts (rowid, prompt, title) VALUES (?, ?, ?)",
+                             (entry_id, (prompt or "")[:1000], title))
+            self._db.commit()
+            self._puts += 1
+            due = self.retention_interval and self._puts % self.retention_interval == 0
+        if due:
+            self.apply_retention()
+        return entry_id
+
+    def read(self, content_hash):
+        """Returns the stored content, or None when the blob is not in the archive (or its file is gone)."""
+        with self._lock:
+            row = self._db.execute("SELECT codec FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(self._blob_path(content_hash), "rb") as file:
+                    stored = file.read()
+            except FileNotFoundError:
+                return None
+        return decompress(stored, row[0]).decode("utf-8")
+
+    def get(self, entry_id):
+        """Returns the catalog entry with its content, or None when the entry or its content is gone."""
+        entries = self._entries("SELECT * FROM outputs WHERE id = ?", (entry_id,))
+        if not entries:
+            return None
+        entry = entries[0]
+        entry["content"] = self.read(entry["content_hash"])
+        return entry if entry["content"] is not None else None
+
+    def search(self, kind=None, user=None, text="", since=None, limit=50):
+        """Returns catalog entries, newest first, filtered by kind, user, creation time and words of the prompt or title."""
+        clauses, params = [], []
+        for column, value in (("o.kind = ?", kind), ("o.user = ?", user), ("o.created >= ?", since)):
+            if value:
+                clauses.append(column)
+                params.append(value)
+        words = re.findall(r"\w+", text or "")
+        if words:
+            clauses.append("o.id IN (SELECT rowid FROM outputs_fts WHERE outputs_fts MATCH ?)")
+            params.append(" ".join(f'"{word}"' for word in words))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._entries(f"SELECT o.* FROM outputs o {where} ORDER BY o.created DESC LIMIT ?", params + [limit])
+
+    def apply_retention(self, retention_days=None, max_per_kind=None):
+        """Drops entries older than retention_days or beyond the newest max_per_kind of their kind, then unused blobs.
+
+        Returns (entries removed, blobs removed). 0 or None disables either rule.
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        max_per_kind = self.max_per_kind if max_per_kind is None else max_per_kind
+        with self._lock:
+            expired = []
+            if retention_days:
+                expired += self._db.execute("SELECT id, prompt, title FROM outputs WHERE created < ?",
+                                            (time.time() - retention_days * 86400,)).fetchall()
+            if max_per_kind:
+                expired += self._db.execute(
+                    "SELECT id, prompt, title FROM (SELECT id, prompt, title, ROW_NUMBER() OVER "
+                    "(PARTITION BY kind ORDER BY created DESC) AS rank FROM outputs) WHERE rank > ?", (max_per_kind,)).fetchall()
+            expired = list({row[0]: row for row in expired}.values())
+            for entry_id, prompt, title in expired:
+                self._db.execute("INSERT INTO outputs_fts (outputs_fts, rowid, prompt, title) VALUES ('delete', ?, ?, ?)",
+                                 (entry_id, prompt, title))
+                self._db.execute("DELETE FROM outputs WHERE id = ?", (entry_id,))
+            unused = [row[0] for row in self._db.execute(
+                "SELECT hash FROM blobs WHERE hash NOT IN (SELECT content_hash FROM outputs)").fetchall()]
+            for content_hash in unused:
+                self._db.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+            self._db.commit()
+            # Still under the lock: a put of the same content in between would otherwise find no
+            # blobs row, write the file, and then lose it to this unlink
+            for content_hash in unused:
+                try:
+                    os.remove(self._blob_path(content_hash))
+                except FileNotFoundError:
+                    pass
+        return len(expired), len(unused)
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]
+            blobs, size, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        return {"entries": entries, "blobs": blobs, "bytes": size, "stored_bytes": stored, "codec": CODEC}
+
+    def _entries(self, sql, params):
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+_shared_archive = None
+_shared_lock = threading.Lock()
+
+def get_archive():
+    """Returns the process wide archive stored in ARCHIVE_DIR."""
+    global _shared_archive
+    with _shared_lock:
+        if _shared_archive is None:
+            _shared_archive = OutputArchive(ARCHIVE_DIR, ARCHIVE_RETENTION_DAYS, ARCHIVE_MAX_PER_KIND)
+        return _shared_archive
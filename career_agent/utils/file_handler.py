@@ -1,14 +1,77 @@
+import atexit
+import logging
 import os
+import queue
+import threading
+import uuid
 from datetime import datetime
+from utils.archive import get_archive
+from utils.tracing import tracer
 
-def save_file(data, filename):
-    """saves data to a markdown file"""
-    folder_name = "Agent_output"
-    os.makedirs(folder_name, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"{filename}_{timestamp}.md"
-    file_path = os.path.join(folder_name, filename)
-    with open(file_path, "w", encoding="utf-8") as file:
-        file.write(data)
-    return file_path 
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+class OutputStore:
+    """Archives agent output through a bounded background writer thread, and writes download files."""
+
+    def __init__(self, folder_name="Agent_output", max_pending=256, archive=None):
+        self.folder_name = folder_name
+        # None archives into the shared archive in ARCHIVE_DIR
+        self.archive = archive
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._writer = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def make_path(self, filename, extension="md"):
+        """Builds a unique path; microseconds plus a random suffix keep concurrent saves apart."""
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        return os.path.join(self.folder_name, f"{filename}_{timestamp}_{uuid.uuid4().hex[:8]}.{extension}")
+
+    def write(self, data, filename, extension="md"):
+        """Writes data right away and returns the path, for files handed to the user as downloads."""
+        file_path = self.make_path(filename, extension)
+        os.makedirs(self.folder_name, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            file.write(data)
+        return file_path
+
+    def save(self, data, filename, user=None, prompt=None):
+        """Queues data to be archived under the kind filename and returns it unchanged.
+
+        Blocks only when max_pending writes are already queued, which keeps memory bounded
+        if the disk falls behind.
+        """
+        self._start_writer()
+        self._pending.put((filename, data, user, prompt))
+        return data
+
+    def flush(self):
+        """Waits until every queued write has reached the disk."""
+        if self._writer is not None:
+            self._pending.join()
+
+    def _start_writer(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="output-writer", daemon=True)
+                    self._writer.start()
+
+    def _write_loop(self):
+        # Any failure only loses that one output: if the thread died, save() would block once the
+        # queue filled up and the flush at exit would wait forever
+        while True:
+            kind, data, user, prompt = self._pending.get()
+            try:
+                with tracer.span("archive.put", kind=kind, bytes=len(data)):
+                    (self.archive or get_archive()).put(data, kind, user, prompt)
+            except Exception:
+                logger.exception("Failed to archive %s", kind)
+            finally:
+                self._pending.task_done()
+
+output_store = OutputStore()
+
+def save_file(data, filename, user=None, prompt=None):
+    """archives data in the background and returns the data"""
+    return output_store.save(data, filename, user, prompt)
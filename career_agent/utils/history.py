@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config.settings import HISTORY_BACKEND, HISTORY_DB_PATH, HISTORY_MAX_SESSIONS, HISTORY_IDLE_TIMEOUT
+
+class InMemoryHistoryStore:
+    """Keeps chat history per session in memory.
+
+    Sessions idle for longer than idle_timeout seconds are dropped, and the least recently
+    used sessions are evicted once there are more than max_sessions.
+    """
+
+    def __init__(self, max_sessions=1000, idle_timeout=3600):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """Returns a copy of the session's messages."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            entry[0] = time.monotonic()
+            return list(entry[1])
+
+    def set(self, session_id, messages):
+        with self._lock:
+            self._sessions[session_id] = [time.monotonic(), list(messages)]
+            self._sessions.move_to_end(session_id)
+            self._evict()
+
+    def clear(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict(self):
+        oldest_allowed = time.monotonic() - self.idle_timeout
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and last_used >= oldest_allowed:
+                break
+            del self._sessions[session_id]
+
+class SQLiteHistoryStore:
+    """Keeps chat history per session in a SQLite file so conversations survive restarts."""
+
+    def __init__(self, db_path, namespace="default", max_sessions=1000, idle_timeout=3600):
+        self.namespace = namespace
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS chat_history (
+                namespace TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                messages TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, session_id)
+            )""")
+        self._db.commit()
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT messages FROM chat_history WHERE namespace = ? AND session_id = ? AND last_used >= ?",
+                (self.namespace, session_id, time.time() - self.idle_timeout)).fetchone()
+            if row is None:
+                return []
+            self._db.execute(
+                "UPDATE chat_history SET last_used = ? WHERE namespace = ? AND session_id = ?",
+                (time.time(), self.namespace, session_id))
+            self._db.commit()
+            return json.loads(row[0])
+
+    def set(self, session_id, messages):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO chat_history VALUES (?, ?, ?, ?)",
+                (self.namespace, session_id, json.dumps(messages), time.time()))
+            self._db.execute(
+                "DELETE FROM chat_history WHERE namespace = ? AND (last_used < ? OR session_id NOT IN "
+                "(SELECT session_id FROM chat_history WHERE namespace = ? ORDER BY last_used DESC LIMIT ?))",
+                (self.namespace, time.time() - self.idle_timeout, self.namespace, self.max_sessions))
+            self._db.commit()
+
+    def clear(self, session_id):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM chat_history WHERE namespace = ? AND session_id = ?", (self.namespace, session_id))
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM chat_history WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+def create_history_store(namespace):
+    """Builds the history store selected by HISTORY_BACKEND ("memory" or "sqlite")."""
+    if HISTORY_BACKEND == "sqlite":
+        return SQLiteHistoryStore(HISTORY_DB_PATH, namespace, HISTORY_MAX_SESSIONS, HISTORY_IDLE_TIMEOUT)
+    return InMemoryHistoryStore(HISTORY_MAX_SESSIONS, HISTORY_IDLE_TIMEOUT)
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from utils.response_cache import normalize_prompt
+from config.settings import JOB_INDEX_PATH
+
+FIELD_NAMES = {
+    "job title": "title",
+    "title": "title",
+    "company": "company",
+    "location": "location",
+    "required skills": "skills",
+    "skills": "skills",
+    "experience level": "experience_level",
+    "experience": "experience_level",
+    "job description": "description",
+    "job description (summarized)": "description",
+    "description": "description",
+    "application link": "link",
+    "link": "link",
+}
+_FIELD_LINE = re.compile(r"^\s*(?:[-*]\s*)?\**([A-Za-z ()]+?)\**\s*:\s*\**\s*(.*)$")
+_HEADING = re.compile(r"^\s*#{2,6}\s*(?:\d+\.\s*)?(.+?)\s*$")
+_URL = re.compile(r"https?://[^\s)\]>]+")
+
+@dataclass
+class JobListing:
+    title: str
+    company: str
+    location: str = ""
+    skills: list = field(default_factory=list)
+    experience_level: str = ""
+    description: str = ""
+    link: str = ""
+
+    @property
+    def key(self):
+        """Identity used for deduplication: the same company, title and link is the same listing."""
+        parts = [normalize_prompt(self.company), normalize_prompt(self.title), self.link.strip().rstrip("/").lower()]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def to_markdown(self):
+        lines = [f"### {self.title}", f"- **Company:** {self.company}"]
+        if self.location:
+            lines.append(f"- **Location:** {self.location}")
+        if self.skills:
+            lines.append(f"- **Required Skills:** {', '.join(self.skills)}")
+        if self.experience_level:
+            lines.append(f"- **Experience Level:** {self.experience_level}")
+        if self.description:
+            lines.append(f"- **Job Description:** {self.description}")
+        if self.link:
+            lines.append(f"- **Application Link:** {self.link}")
+        return "\n".join(lines)
+
+def parse_job_listings(markdown):
+    """Extracts listings from job search markdown written in the JOB_SEARCH_MESSAGE format.
+
+    A listing starts at a heading or a Job Title line and needs at least a title and a company.
+    """
+    listings, current = [], {}
+
+    def finish():
+        if current.get("title") and current.get("company"):
+            link = _URL.search(current.get("link", ""))
+            listings.append(JobListing(
+                title=current["title"],
+                company=current["company"],
+                location=current.get("location", ""),
+                skills=[s.strip() for s in re.split(r"[,;]", current.get("skills", "")) if s.strip()],
+                experience_level=current.get("experience_level", ""),
+                description=current.get("description", ""),
+                link=link.group(0) if link else "",
+            ))
+
+    for line in markdown.splitlines():
+        heading_match = _HEADING.match(line)
+        field_match = _FIELD_LINE.match(line)
+        name = FIELD_NAMES.get(field_match.group(1).strip().lower()) if field_match else None
+        if heading_match or name == "title":
+            finish()
+            current = {}
+            heading = heading_match.group(1).strip("* ") if heading_match else None
+            if heading:
+                current["title"] = heading
+        if name:
+            value = field_match.group(2).strip().strip("*").strip()
+            if value:
+                current[name] = value
+    finish()
+    return listings
+
+class JobIndex:
+    """Local SQLite index of every job listing seen, with FTS5 search over its fields."""
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                title TEXT, company TEXT, location TEXT, skills TEXT,
+                experience_level TEXT, description TEXT, link TEXT,
+                first_seen REAL, last_seen REAL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+                title, company, location, skills, experience_level, description,
+                content='listings', content_rowid='id'
+            );
+            CREATE TABLE IF NOT EXISTS query_listings (
+                query TEXT NOT NULL,
+                listing_id INTEGER NOT NULL,
+                PRIMARY KEY (query, listing_id)
+            );
+        """)
+        self._db.commit()
+
+    def add(self, listings, query=None):
+        """Stores listings, skipping ones already indexed, and returns how many were new."""
+        added = 0
+        now = time.time()
+        with self._lock:
+            for listing in listings:
+                row = self._db.execute("SELECT id FROM listings WHERE key = ?", (listing.key,)).fetchone()
+                if row is None:
+                    values = (listing.title, listing.company, listing.location, ", ".join(listing.skills),
+                              listing.experience_level, listing.description)
+                    listing_id = self._db.execute(
+                        "INSERT INTO listings (key, title, company, location, skills, experience_level, description, "
+                        "link, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (listing.key,) + values + (listing.link, now, now)).lastrowid
+                    self._db.execute(
+                        "INSERT INTO listings_fts (rowid, title, company, location, skills, experience_level, description) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", (listing_id,) + values)
+                    added += 1
+                else:
+                    listing_id = row[0]
+                    self._db.execute("UPDATE listings SET last_seen = ? WHERE id = ?", (now, listing_id))
+                if query:
+                    self._db.execute("INSERT OR IGNORE INTO query_listings VALUES (?, ?)",
+                                     (normalize_prompt(query), listing_id))
+            self._db.commit()
+        return added
+
+    def for_query(self, query):
+        """Returns the listings previously found for this search query."""
+        return self._select(
+            "SELECT l.* FROM listings l JOIN query_listings q ON q.listing_id = l.id "
+            "WHERE q.query = ? ORDER BY l.last_seen DESC", (normalize_prompt(query),))
+
+    def listings_after(self, last_id):
+        """Returns (id, listing) pairs indexed after the given id, oldest first."""
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM listings WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+        return [(r[0], self._listing(r)) for r in rows]
+
+    def search(self, skills="", location="", experience_level="", text="", limit=100):
+        """Filters indexed listings by skills, location, experience level and free text, without any model call."""
+        clauses = []
+        for column, value in (("skills", skills), ("location", location), ("experience_level", experience_level)):
+            for term in re.split(r"[,;]", value):
+                words = re.findall(r"\w+", term)
+                if words:
+                    clauses.append(f'{column} : "{" ".join(words)}"')
+        words = re.findall(r"\w+", text)
+        if words:
+            clauses.append(" ".join(f'"{word}"' for word in words))
+        if not clauses:
+            return self._select("SELECT * FROM listings ORDER BY last_seen DESC LIMIT ?", (limit,))
+        return self._select(
+            "SELECT l.* FROM listings_fts f JOIN listings l ON l.id = f.rowid "
+            "WHERE listings_fts MATCH ? ORDER BY rank LIMIT ?", (" AND ".join(clauses), limit))
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def _select(self, sql, params):
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [self._listing(r) for r in rows]
+
+    def _listing(self, row):
+        return JobListing(title=row[2], company=row[3], location=row[4],
+                          skills=[s for s in row[5].split(", ") if s], experience_level=row[6],
+                          description=row[7], link=row[8])
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+def get_job_index():
+    """Returns the process wide job index stored at JOB_INDEX_PATH."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = JobIndex(JOB_INDEX_PATH)
+        return _shared_index
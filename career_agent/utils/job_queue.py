@@ -0,0 +1,256 @@
+"""
+Background job queue stored in SQLite, for generations too slow to hold a UI request open
+"""
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from config.settings import (JOB_QUEUE_PATH, JOB_QUEUE_WORKERS, JOB_QUEUE_MODE, JOB_QUEUE_LEASE,
+                             JOB_QUEUE_MAX_ATTEMPTS)
+
+JOB_HANDLERS = {}
+# Modules whose import registers the handlers; worker processes import them on start
+HANDLER_MODULES = ["agents.background"]
+
+def register_job(kind):
+    """Registers a handler for a job kind.
+
+    The handler is called with the job payload and a report(progress) callback, and returns
+    the result text. report stores partial output; the job's lease is renewed while the handler runs.
+    """
+    def decorator(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+_COLUMNS = ["id", "kind", "payload", "status", "progress", "result", "error", "attempts",
+            "created", "started", "finished", "heartbeat"]
+
+def _connect(db_path):
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress TEXT DEFAULT '',
+            result TEXT,
+            error TEXT,
+            attempts INTEGER DEFAULT 0,
+            created REAL, started REAL, finished REAL, heartbeat REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+    """)
+    return db
+
+class JobWorker:
+    """Claims jobs from the database one at a time and runs their handlers.
+
+    A running job holds a lease that a heartbeat thread renews every lease / 3 seconds for as long
+    as its handler runs, however long a single model or search call takes. A job whose lease ran
+    out, because its worker thread or process died, is claimed again until it has used max_attempts.
+    """
+
+    def __init__(self, db_path, lease=300, max_attempts=3, poll_interval=0.2, progress_interval=0.5):
+        self.db_path = db_path
+        self.db = _connect(db_path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+
+    def claim(self):
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired too many times', finished = ? "
+                "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?", (now, now - self.lease, self.max_attempts))
+            row = self.db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started = ?, heartbeat = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?) "
+                "ORDER BY created LIMIT 1) RETURNING id, kind, payload", (now, now, now - self.lease)).fetchone()
+        return row
+
+    def _heartbeat(self, job_id, done):
+        # Its own connection, so renewals never interleave with the worker's transactions
+        db = _connect(self.db_path)
+        try:
+            while not done.wait(self.lease / 3):
+                with db:
+                    db.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running'", (time.time(), job_id))
+        finally:
+            db.close()
+
+    def run_one(self):
+        """Runs the next job and returns True, or returns False when the queue is empty."""
+        row = self.claim()
+        if row is None:
+            return False
+        job_id, kind, payload = row
+        last_report = 0.0
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, done), name=f"job-heartbeat-{job_id[:8]}", daemon=True)
+        heartbeat.start()
+
+        def report(progress):
+            nonlocal last_report
+            if time.monotonic() - last_report >= self.progress_interval:
+                last_report = time.monotonic()
+                with self.db:
+                    self.db.execute("UPDATE jobs SET progress = ?, heartbeat = ? WHERE id = ?", (progress, time.time(), job_id))
+
+        try:
+            handler = JOB_HANDLERS[kind]
+            result = handler(json.loads(payload), report)
+        except Exception:
+            with self.db:
+                self.db.execute("UPDATE jobs SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                                (traceback.format_exc(limit=5), time.time(), job_id))
+        else:
+            with self.db:
+                self.db.execute("UPDATE jobs SET status = 'done', result = ?, progress = '', finished = ? WHERE id = ?",
+                                (result, time.time(), job_id))
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def run(self, stop, wakeup=None):
+        while not stop.is_set():
+            if not self.run_one():
+                if wakeup is not None:
+                    wakeup.wait(self.poll_interval)
+                    wakeup.clear()
+                else:
+                    stop.wait(self.poll_interval)
+
+def _exit_with_parent(parent):
+    # A killed app cannot stop its workers; they exit here and their jobs are recovered on restart
+    while os.getppid() == parent:
+        time.sleep(1)
+    os._exit(1)
+
+def _process_worker(db_path, lease, max_attempts, modules, stop):
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+    for module in modules:
+        importlib.import_module(module)
+    JobWorker(db_path, lease, max_attempts).run(stop)
+
+class JobQueue:
+    """Queue of agent jobs with a pool of worker threads or processes.
+
+    enqueue() returns a job id at once; status, partial progress and the result are read back
+    with get(). Jobs left running by a stopped worker are queued again once their lease has run out.
+    """
+
+    def __init__(self, db_path, workers=2, mode="thread", lease=300, max_attempts=3):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown JOB_QUEUE_MODE '{mode}', expected thread or process")
+        self.db_path = db_path
+        self.workers = workers
+        self.mode = mode
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.db = _connect(db_path)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = None
+        self._pool = []
+
+    def recover(self):
+        """Queues again the running jobs whose lease has run out, failing ones out of attempts.
+
+        Jobs with a live heartbeat are left alone: another app instance sharing the database may still be running them.
+        """
+        now = time.time()
+        with self._lock, self.db:
+            self.db.execute("UPDATE jobs SET status = 'failed', error = 'Interrupted too many times', finished = ? "
+                            "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                            (now, now - self.lease, self.max_attempts))
+            return self.db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running' AND heartbeat < ?",
+                                   (now - self.lease,)).rowcount
+
+    def start(self):
+        if self._pool:
+            return self
+        for module in HANDLER_MODULES:
+            importlib.import_module(module)
+        self.recover()
+        if self.mode == "process":
+            context = multiprocessing.get_context("spawn")
+            self._stop = context.Event()
+            self._pool = [context.Process(target=_process_worker, name=f"job-worker-{i}", daemon=True,
+                                          args=(self.db_path, self.lease, self.max_attempts, list(HANDLER_MODULES), self._stop))
+                          for i in range(self.workers)]
+        else:
+            self._stop = threading.Event()
+            self._pool = [threading.Thread(target=JobWorker(self.db_path, self.lease, self.max_attempts).run,
+                                           args=(self._stop, self._wakeup), name=f"job-worker-{i}", daemon=True)
+                          for i in range(self.workers)]
+        for worker in self._pool:
+            worker.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stops the workers after their current job."""
+        if self._stop is not None:
+            self._stop.set()
+            self._wakeup.set()
+            for worker in self._pool:
+                worker.join(timeout)
+        self._pool = []
+
+    def enqueue(self, kind, payload):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {', '.join(JOB_HANDLERS)}")
+        job_id = uuid.uuid4().hex
+        with self._lock, self.db:
+            self.db.execute("INSERT INTO jobs (id, kind, payload, status, created) VALUES (?, ?, ?, 'queued', ?)",
+                            (job_id, kind, json.dumps(payload), time.time()))
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """Returns the job as a dict, or None if there is no job with this id."""
+        with self._lock:
+            row = self.db.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def recent(self, limit=20):
+        with self._lock:
+            rows = self.db.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def wait(self, job_id, timeout=None, interval=0.1):
+        """Blocks until the job is done or failed and returns it."""
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            job = self.get(job_id)
+            if job["status"] in ("done", "failed") or (deadline and time.monotonic() > deadline):
+                return job
+            time.sleep(interval)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+def get_job_queue():
+    """Returns the process wide job queue at JOB_QUEUE_PATH, starting its workers on first use."""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = JobQueue(JOB_QUEUE_PATH, JOB_QUEUE_WORKERS, JOB_QUEUE_MODE, JOB_QUEUE_LEASE,
+                                     JOB_QUEUE_MAX_ATTEMPTS).start()
+        return _shared_queue
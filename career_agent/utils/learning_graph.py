@@ -0,0 +1,117 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from utils.response_cache import normalize_prompt
+from config.settings import LEARNING_GRAPH_PATH
+
+def section_key(topic, instructions):
+    """Content hash key of a tutorial section: the same topic written with the same instructions is the same section."""
+    return hashlib.sha256(f"{instructions}\n{normalize_prompt(topic)}".encode("utf-8")).hexdigest()
+
+class TopicGraph:
+    """Local SQLite graph of learning topics, their prerequisites and the tutorial sections written for them.
+
+    A topic is expanded once: its prerequisites are stored, even when there are none, so
+    later paths through it need no planning call. Sections are stored under section_key
+    and shared by every learning path that includes the topic.
+    """
+
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS topics (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                expanded REAL
+            );
+            CREATE TABLE IF NOT EXISTS prerequisites (
+                topic TEXT NOT NULL,
+                prerequisite TEXT NOT NULL,
+                position INTEGER,
+                PRIMARY KEY (topic, prerequisite)
+            );
+            CREATE TABLE IF NOT EXISTS sections (
+                key TEXT PRIMARY KEY,
+                topic TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created REAL,
+                uses INTEGER DEFAULT 0
+            );
+        """)
+        self._db.commit()
+
+    def prerequisites(self, topic):
+        """Returns the names of the topic's prerequisites, or None if the topic was never expanded."""
+        key = normalize_prompt(topic)
+        with self._lock:
+            if self._db.execute("SELECT expanded FROM topics WHERE key = ?", (key,)).fetchone() in (None, (None,)):
+                return None
+            rows = self._db.execute(
+                "SELECT t.name FROM prerequisites p JOIN topics t ON t.key = p.prerequisite "
+                "WHERE p.topic = ? ORDER BY p.position", (key,)).fetchall()
+        return [row[0] for row in rows]
+
+    def set_prerequisites(self, topic, prerequisites):
+        key = normalize_prompt(topic)
+        with self._lock:
+            self._db.execute("INSERT INTO topics (key, name, expanded) VALUES (?, ?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET expanded = excluded.expanded", (key, topic, time.time()))
+            for position, name in enumerate(prerequisites):
+                prerequisite = normalize_prompt(name)
+                if prerequisite == key:
+                    continue
+                self._db.execute("INSERT OR IGNORE INTO topics (key, name) VALUES (?, ?)", (prerequisite, name))
+                self._db.execute("INSERT OR IGNORE INTO prerequisites VALUES (?, ?, ?)", (key, prerequisite, position))
+            self._db.commit()
+
+    def section(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT content FROM sections WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE sections SET uses = uses + 1 WHERE key = ?", (key,))
+                self._db.commit()
+        return row[0] if row else None
+
+    def put_section(self, key, topic, content):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO sections (key, topic, content, created, uses) VALUES (?, ?, ?, ?, 1)",
+                             (key, normalize_prompt(topic), content, time.time()))
+            self._db.commit()
+
+    def path(self, topic):
+        """Returns the topic and its stored prerequisites, prerequisites first, each once (cycles are cut)."""
+        order, seen = [], set()
+
+        def visit(name, ancestors):
+            key = normalize_prompt(name)
+            if key in seen or key in ancestors:
+                return
+            for prerequisite in self.prerequisites(name) or []:
+                visit(prerequisite, ancestors | {key})
+            seen.add(key)
+            order.append(name)
+
+        visit(topic, frozenset())
+        return order
+
+    def stats(self):
+        with self._lock:
+            topics = self._db.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+            sections, uses = self._db.execute("SELECT COUNT(*), COALESCE(SUM(uses), 0) FROM sections").fetchone()
+        return {"topics": topics, "sections": sections, "section_uses": uses}
+
+_shared_graph = None
+_shared_lock = threading.Lock()
+
+def get_topic_graph():
+    """Returns the process wide topic graph stored at LEARNING_GRAPH_PATH."""
+    global _shared_graph
+    with _shared_lock:
+        if _shared_graph is None:
+            _shared_graph = TopicGraph(LEARNING_GRAPH_PATH)
+        return _shared_graph
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+from utils.response_cache import HashingEmbedder
+from utils.job_index import get_job_index
+from config.settings import MATCH_ANN_THRESHOLD
+
+def listing_text(listing):
+    return " ".join([listing.title, listing.company, listing.location, " ".join(listing.skills),
+                     listing.experience_level, listing.description])
+
+def embed_texts(embedder, texts, batch_size=512):
+    """Embeds texts into a float32 matrix of unit rows.
+
+    The embedder is either a callable mapping one text to a vector, or an object with an
+    `embed_batch(texts)` method for models that are faster on batches.
+    """
+    batches = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        if hasattr(embedder, "embed_batch"):
+            batches.append(np.asarray(embedder.embed_batch(batch), dtype=np.float32))
+        else:
+            batches.append(np.asarray([embedder(text) for text in batch], dtype=np.float32))
+    if not batches:
+        return np.zeros((0, 0), dtype=np.float32)
+    vectors = np.vstack(batches)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class IVFIndex:
+    """Approximate nearest neighbour index: k-means buckets, searching only the closest n_probe buckets."""
+
+    def __init__(self, vectors, n_lists=None, n_probe=None, iterations=8, seed=0):
+        rng = np.random.default_rng(seed)
+        n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        # By default a tenth of the buckets are probed, so a search scans about a tenth of the corpus
+        self.n_probe = min(n_probe or max(8, n_lists // 10), n_lists)
+        sample = vectors[rng.choice(len(vectors), size=min(len(vectors), n_lists * 32), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[assignment == i]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[i] = centroid / (np.linalg.norm(centroid) or 1)
+        self.centroids = centroids
+        assignment = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 65536):
+            assignment[start:start + 65536] = np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        self.order = order
+        self.offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+
+    def candidates(self, query):
+        closest = np.argpartition(-(self.centroids @ query), self.n_probe - 1)[:self.n_probe]
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in closest])
+
+class JobMatcher:
+    """Ranks job listings against a resume by cosine similarity of their embeddings.
+
+    Listings are embedded once when added. Ranking is one matrix-vector product over the
+    corpus, or over the candidate buckets of an IVFIndex once the corpus has at least
+    ann_threshold listings (0 disables the approximate index).
+    """
+
+    def __init__(self, embedder=None, ann_threshold=200000):
+        self.embedder = embedder or HashingEmbedder()
+        self.ann_threshold = ann_threshold
+        self.listings = []
+        self.vectors = None
+        self.last_id = 0
+        self._ann = None
+        self._lock = threading.Lock()
+
+    def add(self, listings, vectors=None):
+        """Adds listings, embedding them unless their vectors are given."""
+        if not listings:
+            return
+        if vectors is None:
+            vectors = embed_texts(self.embedder, [listing_text(listing) for listing in listings])
+        with self._lock:
+            self.listings.extend(listings)
+            self.vectors = vectors if self.vectors is None else np.vstack([self.vectors, vectors])
+            self._ann = None
+
+    def sync(self, job_index):
+        """Embeds listings added to the job index since the last sync."""
+        rows = job_index.listings_after(self.last_id)
+        if rows:
+            self.add([listing for _, listing in rows])
+            self.last_id = rows[-1][0]
+
+    def rank(self, resume, top_k=20):
+        """Returns up to top_k (score, listing) pairs, best match first."""
+        with self._lock:
+            if self.vectors is None:
+                return []
+            if self.ann_threshold and len(self.listings) >= self.ann_threshold and self._ann is None:
+                self._ann = IVFIndex(self.vectors)
+            vectors, listings, ann = self.vectors, self.listings, self._ann
+        query = embed_texts(self.embedder, [resume])[0]
+        candidates = ann.candidates(query) if ann is not None else None
+        scores = (vectors[candidates] if candidates is not None else vectors) @ query
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        ids = candidates[best] if candidates is not None else best
+        return [(float(scores[b]), listings[i]) for b, i in zip(best, ids)]
+
+_shared_matcher = None
+_shared_lock = threading.Lock()
+
+def get_job_matcher():
+    """Returns the process wide matcher, brought up to date with the job index."""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            _shared_matcher = JobMatcher(ann_threshold=MATCH_ANN_THRESHOLD)
+        _shared_matcher.sync(get_job_index())
+        return _shared_matcher
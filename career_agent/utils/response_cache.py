@@ -0,0 +1,151 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from config.settings import (RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_PATH, RESPONSE_CACHE_SIZE,
+                             RESPONSE_CACHE_TTL, RESPONSE_CACHE_SIMILARITY)
+
+def normalize_prompt(text):
+    """Lowercases, collapses whitespace and strips trailing punctuation so near-identical prompts share a key."""
+    return re.sub(r"\s+", " ", text.lower()).strip(" .?!")
+
+class HashingEmbedder:
+    """Small local embedder that hashes words and word pairs into a fixed-size unit vector.
+
+    Any callable mapping a string to a list of floats can be used instead.
+    """
+
+    def __init__(self, dimensions=256):
+        self.dimensions = dimensions
+
+    def __call__(self, text):
+        vector = [0.0] * self.dimensions
+        words = re.findall(r"\w+", text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.md5(feature.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dimensions] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+class ResponseCache:
+    """SQLite backed cache of agent answers keyed on system message and normalized prompt.
+
+    Lookups try an exact match first and, when an embedder is configured and the caller allows
+    it, fall back to the most similar cached prompt for the same system message. Entries expire
+    after ttl seconds and the least recently used ones are evicted beyond max_entries.
+    """
+
+    def __init__(self, db_path, max_entries=1000, ttl=86400, embedder=None, similarity_threshold=0.92):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                system_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                embedding BLOB,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)")
+        self._db.commit()
+
+    def _keys(self, system_message, prompt):
+        system_hash = hashlib.sha256(system_message.encode("utf-8")).hexdigest()
+        key = hashlib.sha256(f"{system_hash}\n{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+        return system_hash, key
+
+    def get(self, system_message, prompt, similar=True):
+        """Returns the cached response or None, updating the hit and miss counters.
+
+        similar=False restricts the lookup to exact matches of the normalized prompt.
+        """
+        system_hash, key = self._keys(system_message, prompt)
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None and similar and self.embedder is not None:
+                key, row = self._most_similar(system_hash, normalize_prompt(prompt))
+                if row is not None:
+                    self.similar_hits += 1
+            elif row is not None:
+                self.hits += 1
+            if row is None:
+                self.misses += 1
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row[0]
+
+    def _most_similar(self, system_hash, normalized):
+        query = self.embedder(normalized)
+        best_key, best_row, best_score = None, None, self.similarity_threshold
+        rows = self._db.execute(
+            "SELECT key, response, embedding FROM responses WHERE system_hash = ? AND embedding IS NOT NULL",
+            (system_hash,))
+        for key, response, blob in rows:
+            score = sum(a * b for a, b in zip(query, array("f", blob)))
+            if score >= best_score:
+                best_key, best_row, best_score = key, (response,), score
+        return best_key, best_row
+
+    def put(self, system_message, prompt, response, similar=True):
+        system_hash, key = self._keys(system_message, prompt)
+        embedding = None
+        if similar and self.embedder is not None:
+            embedding = array("f", self.embedder(normalize_prompt(prompt))).tobytes()
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, system_hash, response, embedding, now, now))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)", (self.max_entries,))
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.similar_hits) / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_response_cache():
+    """Returns the process wide cache configured in config.settings, or None when caching is disabled."""
+    global _shared_cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(
+                RESPONSE_CACHE_PATH,
+                max_entries=RESPONSE_CACHE_SIZE,
+                ttl=RESPONSE_CACHE_TTL,
+                embedder=HashingEmbedder() if RESPONSE_CACHE_SIMILARITY > 0 else None,
+                similarity_threshold=RESPONSE_CACHE_SIMILARITY,
+            )
+        return _shared_cache
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from utils.response_cache import normalize_prompt
+from utils.tracing import tracer
+
+class RateLimiter:
+    """Token bucket allowing `rate` calls per second with bursts of up to `burst` calls."""
+
+    def __init__(self, rate=1.0, burst=3):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        # Takes a token and returns 0, or returns the seconds until one is available
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Blocks until a call is allowed."""
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Waits until a call is allowed without blocking the event loop; shares the bucket with acquire."""
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+class CachedSearch:
+    """Wraps a search backend (a callable taking a query string) with a shared result cache.
+
+    Results are cached per normalized query for ttl seconds, concurrent calls for the same
+    query wait on a single backend request, and backend requests go through a rate limiter.
+    """
+
+    def __init__(self, backend, ttl=900, max_entries=512, rate_limiter=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.rate_limiter = rate_limiter
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._results = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _claim(self, key):
+        """Returns ("hit", result), ("wait", future) for a query already being fetched, or ("fetch", future)."""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._results.move_to_end(key)
+                self.hits += 1
+                tracer.increment("search_cache_hits_total")
+                return "hit", cached[1]
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                tracer.increment("search_cache_coalesced_total")
+                return "wait", future
+            future = self._in_flight[key] = Future()
+            self.misses += 1
+            tracer.increment("search_cache_misses_total")
+            return "fetch", future
+
+    def _finish(self, key, future, result=None, error=None):
+        with self._lock:
+            if error is None:
+                self._results[key] = (time.monotonic() + self.ttl, result)
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            del self._in_flight[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def run(self, query):
+        key = normalize_prompt(query)
+        state, value = self._claim(key)
+        if state == "hit":
+            return value
+        if state == "wait":
+            return value.result()
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            result = self.backend(query)
+        except Exception as e:
+            self._finish(key, value, error=e)
+            raise
+        self._finish(key, value, result)
+        return result
+
+    async def arun(self, query):
+        """Async variant of run: waits for the rate limiter and for coalesced requests on the event loop.
+
+        Only the backend request itself runs in a worker thread, since the search backends are blocking.
+        """
+        key = normalize_prompt(query)
+        state, value = self._claim(key)
+        if state == "hit":
+            return value
+        if state == "wait":
+            # Shielded, so a cancelled waiter does not cancel the request other callers are waiting on
+            return await asyncio.shield(asyncio.wrap_future(value))
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+            result = await asyncio.to_thread(self.backend, query)
+        except BaseException as e:
+            # Including cancellation, so callers coalesced on this request are never left waiting
+            self._finish(key, value, error=e)
+            raise
+        self._finish(key, value, result)
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "entries": len(self._results)}
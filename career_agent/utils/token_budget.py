@@ -0,0 +1,58 @@
+import re
+from functools import lru_cache
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+@lru_cache(maxsize=8192)
+def estimate_tokens(text):
+    """Fast local token estimate: words count as one token plus one per extra four characters, symbols as one."""
+    return sum(1 + (len(piece) - 1) // 4 for piece in _TOKEN_PATTERN.findall(text))
+
+def message_tokens(message):
+    # A few tokens of overhead per message for the role and separators
+    return 4 + estimate_tokens(message["content"])
+
+def is_summary(message):
+    return message["role"] == "system" and message["content"].startswith(SUMMARY_PREFIX)
+
+class TokenBudgetTrimmer:
+    """Keeps the newest messages that fit in max_tokens.
+
+    Token counts are memoized per message text, so a turn only counts the new messages.
+    When a summarizer is given, evicted messages are folded into a rolling summary kept
+    as the first message; otherwise they are dropped.
+    """
+
+    def __init__(self, max_tokens=4000, summarizer=None):
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+
+    def trim(self, messages):
+        summary = messages[0]["content"][len(SUMMARY_PREFIX):].strip() if messages and is_summary(messages[0]) else None
+        turns = messages[1:] if summary is not None else list(messages)
+        budget = self.max_tokens - (estimate_tokens(summary) if summary else 0)
+        kept = 0
+        for message in reversed(turns):
+            budget -= message_tokens(message)
+            if budget < 0 and kept:
+                break
+            kept += 1
+        evicted, turns = turns[:len(turns) - kept], turns[len(turns) - kept:]
+        if evicted and self.summarizer is not None:
+            summary = self.summarizer(summary, evicted)
+        if summary:
+            return [{"role": "system", "content": f"{SUMMARY_PREFIX} {summary}"}] + turns
+        return turns
+
+def model_summarizer(get_model):
+    """Builds a summarizer that asks the chat model returned by get_model to fold evicted messages into the running summary."""
+    def summarize(previous_summary, evicted):
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in evicted)
+        prompt = (
+            "Update the summary of a conversation with the new messages below. "
+            "Keep names, facts and open questions, in at most 150 words.\n\n"
+            f"Current summary: {previous_summary or 'none'}\n\nNew messages:\n{transcript}"
+        )
+        return get_model().invoke(prompt).content
+    return summarize
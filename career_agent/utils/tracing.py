@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+
+    @property
+    def stage(self):
+        """Spans are grouped into stages by the part of their name before the first dot: agent, model, tool, file..."""
+        return self.name.split(".", 1)[0]
+
+class Tracer:
+    """Records spans of agent requests and keeps per-stage latency and counter metrics in memory.
+
+    Finished spans are kept in a bounded buffer for export as OpenTelemetry (OTLP) JSON, and
+    the latest `window` durations per stage are kept for percentiles.
+    """
+
+    def __init__(self, max_spans=10000, window=1000):
+        self.spans = deque(maxlen=max_spans)
+        self.window = window
+        self._durations = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(lambda: [0, 0.0])
+        self.counters = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def start_span(self, name, parent=None, **attributes):
+        trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        return Span(name, trace_id, parent.span_id if parent is not None else None, attributes)
+
+    def end_span(self, span, error=None):
+        span.end_ns = time.time_ns()
+        span.error = repr(error) if error is not None else None
+        seconds = (span.end_ns - span.start_ns) / 1e9
+        with self._lock:
+            self.spans.append(span)
+            self._durations[span.stage].append(seconds)
+            totals = self._totals[span.stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        """Times the block as a span, recording any exception on it before re-raising."""
+        span = self.start_span(name, parent, **attributes)
+        error = None
+        try:
+            yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.end_span(span, error)
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def stage_summary(self):
+        """Returns (stage, count, p50 seconds, p95 seconds) for every stage seen, over the recent window."""
+        with self._lock:
+            stages = {stage: sorted(durations) for stage, durations in self._durations.items()}
+            totals = {stage: totals[0] for stage, totals in self._totals.items()}
+        return [(stage, totals[stage], _percentile(d, 50), _percentile(d, 95)) for stage, d in sorted(stages.items())]
+
+    def export_otlp_json(self):
+        """Returns the buffered spans as an OTLP/JSON ExportTraceServiceRequest."""
+        with self._lock:
+            spans = list(self.spans)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", "career_agent")]},
+            "scopeSpans": [{
+                "scope": {"name": "career_agent"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                } for span in spans],
+            }],
+        }]}
+
+    def prometheus_text(self):
+        """Renders stage latencies and counters in the Prometheus text exposition format."""
+        lines = ["# TYPE career_agent_stage_seconds summary"]
+        with self._lock:
+            totals = {stage: list(t) for stage, t in self._totals.items()}
+            counters = dict(self.counters)
+        for stage, count, p50, p95 in self.stage_summary():
+            lines.append(f'career_agent_stage_seconds{{stage="{stage}",quantile="0.5"}} {p50:.6f}')
+            lines.append(f'career_agent_stage_seconds{{stage="{stage}",quantile="0.95"}} {p95:.6f}')
+            lines.append(f'career_agent_stage_seconds_count{{stage="{stage}"}} {count}')
+            lines.append(f'career_agent_stage_seconds_sum{{stage="{stage}"}} {totals[stage][1]:.6f}')
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE career_agent_{name} counter")
+            lines.append(f"career_agent_{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+tracer = Tracer()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = tracer.prometheus_text(), "text/plain; version=0.0.4"
+        elif self.path == "/traces":
+            body, content_type = json.dumps(tracer.export_otlp_json()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serves /metrics (Prometheus) and /traces (OTLP JSON) from a background thread.
+
+    Returns None, after logging why, when the address cannot be bound, so a busy port never stops the app.
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logging.getLogger(__name__).warning("Metrics server not started on %s:%s: %s", host, port, e)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server